@@ -0,0 +1,200 @@
+"""
+End-to-end throughput benchmark
+Drives BusyAzFullScraper against the local mock busy.az server, run in a
+separate process so its CPU and memory don't skew the scraper's numbers, and
+reports throughput, request latency percentiles and memory usage
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import math
+import os
+import resource
+import socket
+import sys
+import tempfile
+import time
+import tracemalloc
+from collections import Counter
+from typing import Dict, List
+
+import aiohttp
+
+from mock_server import add_server_arguments
+from scraper import BusyAzFullScraper
+
+logger = logging.getLogger(__name__)
+
+MOCK_SERVER = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'mock_server.py')
+SERVER_START_TIMEOUT = 10.0
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """Nearest-rank percentile"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    # Round off float error first, e.g. 99.9 / 100 * 1000 == 999.0000000000001
+    rank = max(0, min(len(ordered) - 1, math.ceil(round(pct / 100 * len(ordered), 9)) - 1))
+    return ordered[rank]
+
+
+def free_port() -> int:
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def server_command(args: argparse.Namespace, port: int) -> List[str]:
+    """mock_server.py command line carrying over the benchmark's server options"""
+    server_parser = argparse.ArgumentParser(add_help=False)
+    add_server_arguments(server_parser)
+    command = [sys.executable, MOCK_SERVER, '--host', '127.0.0.1', '--port', str(port)]
+    for dest in vars(server_parser.parse_args([])):
+        command += [f"--{dest.replace('_', '-')}", str(getattr(args, dest))]
+    return command
+
+
+async def start_server(args: argparse.Namespace, port: int) -> asyncio.subprocess.Process:
+    """Launch the mock server and wait until it accepts connections"""
+    process = await asyncio.create_subprocess_exec(
+        *server_command(args, port), stdout=asyncio.subprocess.DEVNULL, stderr=asyncio.subprocess.DEVNULL
+    )
+    deadline = time.monotonic() + SERVER_START_TIMEOUT
+    while True:
+        if process.returncode is not None:
+            raise RuntimeError(f"Mock server exited with code {process.returncode}")
+        try:
+            _, writer = await asyncio.open_connection('127.0.0.1', port)
+            writer.close()
+            await writer.wait_closed()
+            return process
+        except OSError:
+            if time.monotonic() > deadline:
+                process.kill()
+                await process.wait()
+                raise RuntimeError(f"Mock server did not start on port {port}")
+            await asyncio.sleep(0.05)
+
+
+async def stop_server(process: asyncio.subprocess.Process):
+    if process.returncode is None:
+        process.terminate()
+    await process.wait()
+
+
+def latency_trace(latencies: List[float], client_statuses: Counter) -> aiohttp.TraceConfig:
+    """Record per-request wall time and status on the client side"""
+    trace_config = aiohttp.TraceConfig()
+
+    async def on_request_start(session, context, params):
+        context.start = asyncio.get_running_loop().time()
+
+    async def on_request_end(session, context, params):
+        latencies.append(asyncio.get_running_loop().time() - context.start)
+        client_statuses[params.response.status] += 1
+
+    async def on_request_exception(session, context, params):
+        latencies.append(asyncio.get_running_loop().time() - context.start)
+        client_statuses[type(params.exception).__name__] += 1
+
+    trace_config.on_request_start.append(on_request_start)
+    trace_config.on_request_end.append(on_request_end)
+    trace_config.on_request_exception.append(on_request_exception)
+    return trace_config
+
+
+async def run_benchmark(args: argparse.Namespace) -> Dict:
+    port = free_port()
+    server = await start_server(args, port)
+
+    latencies: List[float] = []
+    client_statuses = Counter()
+    with tempfile.TemporaryDirectory(prefix='busy_az_bench_') as output_dir:
+        scraper = BusyAzFullScraper(
+            max_concurrent=args.concurrency,
+            base_url=f"http://127.0.0.1:{port}",
+            output_file=os.path.join(output_dir, 'candidates.csv'),
+            batch_delay=args.batch_delay,
+            page_delay=args.page_delay,
+            trace_configs=[latency_trace(latencies, client_statuses)]
+        )
+
+        if args.tracemalloc:
+            tracemalloc.start()
+        start_time = time.perf_counter()
+        try:
+            candidates = await scraper.scrape_all_pages()
+        finally:
+            elapsed = time.perf_counter() - start_time
+            await stop_server(server)
+
+    heap_peak_mb = None
+    if args.tracemalloc:
+        heap_peak_mb = tracemalloc.get_traced_memory()[1] / 1024 / 1024
+        tracemalloc.stop()
+
+    expected = args.pages * args.per_page
+    return {
+        'pages': args.pages,
+        'expected_candidates': expected,
+        'scraped_candidates': len(candidates),
+        'completeness_pct': round(100 * len(candidates) / expected, 2) if expected else 0.0,
+        'requests': len(latencies),
+        'elapsed_s': round(elapsed, 3),
+        'candidates_per_s': round(len(candidates) / elapsed, 2) if elapsed else 0.0,
+        'requests_per_s': round(len(latencies) / elapsed, 2) if elapsed else 0.0,
+        'latency_ms': {
+            'p50': round(percentile(latencies, 50) * 1000, 2),
+            'p90': round(percentile(latencies, 90) * 1000, 2),
+            'p99': round(percentile(latencies, 99) * 1000, 2),
+            'max': round(max(latencies, default=0.0) * 1000, 2)
+        },
+        'client_statuses': {str(status): n for status, n in client_statuses.items()},
+        # ru_maxrss is reported in kilobytes on Linux; the server process is not included
+        'peak_rss_mb': round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+        'heap_peak_mb': round(heap_peak_mb, 1) if heap_peak_mb is not None else None
+    }
+
+
+def print_report(report: Dict):
+    print("\n" + "=" * 60)
+    print("BUSY.AZ SCRAPER BENCHMARK (mock server)")
+    print("=" * 60)
+    print(f"Candidates:   {report['scraped_candidates']}/{report['expected_candidates']} "
+          f"({report['completeness_pct']}%) from {report['pages']} pages")
+    print(f"Elapsed:      {report['elapsed_s']} s")
+    print(f"Throughput:   {report['candidates_per_s']} candidates/s, {report['requests_per_s']} requests/s")
+    latency = report['latency_ms']
+    print(f"Latency (ms): p50 {latency['p50']}  p90 {latency['p90']}  p99 {latency['p99']}  max {latency['max']}")
+    print(f"Statuses:     {report['client_statuses']}")
+    memory = f"peak RSS {report['peak_rss_mb']} MB"
+    if report['heap_peak_mb'] is not None:
+        memory += f", Python heap peak {report['heap_peak_mb']} MB"
+    print(f"Memory:       {memory}")
+    print("=" * 60 + "\n")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark BusyAzFullScraper against a mock busy.az server')
+    add_server_arguments(parser)
+    parser.add_argument('--concurrency', type=int, default=8)
+    parser.add_argument('--batch-delay', type=float, default=0.0, help='Scraper delay between batches (s)')
+    parser.add_argument('--page-delay', type=float, default=0.0, help='Scraper delay between pages (s)')
+    parser.add_argument('--tracemalloc', action='store_true', help='Also report Python heap peak (slower)')
+    parser.add_argument('--json', help='Write the report to this JSON file')
+    args = parser.parse_args()
+
+    logging.getLogger().setLevel(logging.WARNING)
+    report = asyncio.run(run_benchmark(args))
+    print_report(report)
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
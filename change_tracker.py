@@ -0,0 +1,168 @@
+"""
+Change tracking for busy.az candidate profiles
+Keeps a persisted index of jobseeker id -> content hashes so unchanged
+profiles can skip parsing, and emits field-level diffs for changed ones
+"""
+
+import hashlib
+import json
+import logging
+import os
+import re
+import time
+from typing import Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Markup that differs between requests even when the profile itself is unchanged
+_VOLATILE_PATTERNS = [
+    re.compile(r'<script\b.*?</script>', re.IGNORECASE | re.DOTALL),
+    re.compile(r'<style\b.*?</style>', re.IGNORECASE | re.DOTALL),
+    re.compile(r'<!--.*?-->', re.DOTALL),
+    re.compile(r'<meta\s+name=["\']csrf-token["\'][^>]*>', re.IGNORECASE),
+    re.compile(r'<input[^>]+name=["\']_token["\'][^>]*>', re.IGNORECASE),
+    # Cloudflare email obfuscation uses a random XOR key per response
+    re.compile(r'data-cfemail=["\'][0-9a-f]+["\']', re.IGNORECASE),
+    re.compile(r'/cdn-cgi/l/email-protection#[0-9a-f]+', re.IGNORECASE),
+]
+_BODY_PATTERN = re.compile(r'<body\b[^>]*>(.*)</body>', re.IGNORECASE | re.DOTALL)
+_WHITESPACE_PATTERN = re.compile(r'\s+')
+_JOBSEEKER_ID_PATTERN = re.compile(r'/jobseeker/(\d+)')
+
+
+def jobseeker_id(candidate_url: str) -> str:
+    """Extract the numeric jobseeker id from a profile URL"""
+    match = _JOBSEEKER_ID_PATTERN.search(candidate_url)
+    return match.group(1) if match else candidate_url
+
+
+def normalize_html(html: str) -> str:
+    """Reduce a profile page to the parts that carry candidate data"""
+    body_match = _BODY_PATTERN.search(html)
+    body = body_match.group(1) if body_match else html
+    for pattern in _VOLATILE_PATTERNS:
+        body = pattern.sub('', body)
+    return _WHITESPACE_PATTERN.sub(' ', body).strip()
+
+
+def hash_html(html: str) -> str:
+    """Hash of the normalized profile body"""
+    return hashlib.sha256(normalize_html(html).encode('utf-8')).hexdigest()
+
+
+def hash_record(record: Dict) -> str:
+    """Hash of an extracted candidate record"""
+    payload = json.dumps(record, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def diff_records(old: Dict, new: Dict) -> Dict[str, Dict]:
+    """Field-level differences between two candidate records"""
+    changes = {}
+    for field in sorted(set(old) | set(new)):
+        old_value = old.get(field, '')
+        new_value = new.get(field, '')
+        if old_value != new_value:
+            changes[field] = {'old': old_value, 'new': new_value}
+    return changes
+
+
+class ChangeTracker:
+    def __init__(self, index_path: str = 'busy_az_index.json',
+                 changes_path: str = 'busy_az_changes.jsonl', parser_version: int = 1):
+        self.index_path = index_path
+        self.changes_path = changes_path
+        self.parser_version = parser_version
+        self.index: Dict[str, Dict] = {}
+        self.pending_changes: List[Dict] = []
+        self.stats = {'unchanged': 0, 'added': 0, 'updated': 0, 'rehashed': 0}
+        self.load()
+
+    def load(self):
+        """Load the persisted hash index if present"""
+        if not os.path.exists(self.index_path):
+            return
+        try:
+            with open(self.index_path, 'r', encoding='utf-8') as f:
+                self.index = json.load(f)
+            logger.info(f"📇 Loaded change index: {len(self.index)} profiles")
+        except (OSError, ValueError) as e:
+            logger.error(f"Error loading change index {self.index_path}: {e}")
+            self.index = {}
+
+    def get_unchanged(self, candidate_url: str, html_hash: str) -> Optional[Dict]:
+        """Return the stored record if the profile body has not changed"""
+        entry = self.index.get(jobseeker_id(candidate_url))
+        if (entry and entry.get('html_hash') == html_hash
+                and entry.get('parser_version', 1) == self.parser_version):
+            self.stats['unchanged'] += 1
+            entry['last_seen'] = time.time()
+            return dict(entry['record'])
+        return None
+
+    def update(self, candidate_url: str, html_hash: str, record: Dict) -> Optional[Dict]:
+        """Store a freshly parsed record and return its change event, if any"""
+        candidate_id = jobseeker_id(candidate_url)
+        record_hash = hash_record(record)
+        now = time.time()
+        entry = self.index.get(candidate_id)
+
+        event = None
+        if entry is None:
+            self.stats['added'] += 1
+            event = {'event': 'added', 'id': candidate_id, 'url': candidate_url, 'timestamp': now}
+        else:
+            old_record = entry.get('record', {})
+            changes = diff_records(old_record, record) if entry.get('record_hash') != record_hash else {}
+            if entry.get('parser_version', 1) != self.parser_version:
+                if entry.get('html_hash') == html_hash:
+                    # Same page, newer parser: every difference comes from the parser
+                    changes = {}
+                else:
+                    # Fields introduced by a newer parser are not candidate changes
+                    changes = {field: diff for field, diff in changes.items() if field in old_record}
+
+            if changes:
+                self.stats['updated'] += 1
+                event = {
+                    'event': 'updated',
+                    'id': candidate_id,
+                    'url': candidate_url,
+                    'timestamp': now,
+                    'changes': changes
+                }
+            else:
+                # Page markup or parser changed but the candidate data did not
+                self.stats['rehashed'] += 1
+
+        self.index[candidate_id] = {
+            'html_hash': html_hash,
+            'record_hash': record_hash,
+            'record': record,
+            'parser_version': self.parser_version,
+            'last_seen': now,
+            'last_changed': now if event else entry.get('last_changed', now)
+        }
+
+        if event:
+            self.pending_changes.append(event)
+        return event
+
+    def records(self) -> List[Dict]:
+        """Latest known record of every tracked profile, newest ids first"""
+        ordered = sorted(self.index.items(), key=lambda item: int(item[0]) if item[0].isdigit() else 0, reverse=True)
+        return [dict(entry['record']) for _, entry in ordered]
+
+    def save(self):
+        """Persist the index and append pending change events to the feed"""
+        tmp_path = f"{self.index_path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.index, f, ensure_ascii=False)
+        os.replace(tmp_path, self.index_path)
+
+        if self.pending_changes:
+            with open(self.changes_path, 'a', encoding='utf-8') as f:
+                for event in self.pending_changes:
+                    f.write(json.dumps(event, ensure_ascii=False) + '\n')
+            logger.info(f"📝 Recorded {len(self.pending_changes)} profile changes to {self.changes_path}")
+            self.pending_changes = []
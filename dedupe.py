@@ -0,0 +1,193 @@
+"""
+Candidate deduplication and normalization
+Normalizes phones to E.164 and emails to lowercase, clusters candidates that
+share a mobile phone or email via hash indexes, and writes one canonical record per person
+"""
+
+import csv
+import logging
+import os
+import re
+import sys
+from collections import defaultdict
+from typing import Dict, List, Set
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+INPUT_FILE = 'busy_az_candidates.csv'
+OUTPUT_FILE = 'busy_az_candidates_canonical.csv'
+
+AZ_COUNTRY_CODE = '994'
+# Landlines (e.g. 12 for Baku) are shared by households and offices, so only
+# mobile numbers identify a single candidate
+AZ_MOBILE_PREFIXES = ('10', '50', '51', '55', '60', '70', '77', '99')
+PHONE_FIELDS = ['phone_number', 'mobile_phone', 'home_phone']
+EMAIL_PATTERN = re.compile(r'^[^@\s]+@[^@\s]+\.[^@\s]+$')
+
+
+def normalize_phone(phone: str) -> str:
+    """Normalize a phone number to E.164, assuming Azerbaijan for national numbers"""
+    digits = re.sub(r'\D', '', phone or '')
+    if digits.startswith('00'):
+        digits = digits[2:]
+
+    if len(digits) == 12 and digits.startswith(AZ_COUNTRY_CODE):
+        normalized = digits
+    elif len(digits) == 10 and digits.startswith('0'):
+        # National format, e.g. 0501234567
+        normalized = AZ_COUNTRY_CODE + digits[1:]
+    elif len(digits) == 9:
+        # National format without trunk prefix, e.g. 501234567
+        normalized = AZ_COUNTRY_CODE + digits
+    elif 8 <= len(digits) <= 15 and not digits.startswith('0'):
+        # Already international with another country code
+        normalized = digits
+    else:
+        return ''
+
+    # Placeholder numbers such as +000000000000
+    if not normalized[-9:].strip('0'):
+        return ''
+    return f'+{normalized}'
+
+
+def normalize_email(email: str) -> str:
+    """Lowercase a valid email address, or return '' if it is not one"""
+    email = (email or '').strip().lower()
+    return email if EMAIL_PATTERN.match(email) else ''
+
+
+def normalize_record(record: Dict) -> Dict:
+    """Return a copy of the record with normalized contact fields"""
+    normalized = dict(record)
+    for field in PHONE_FIELDS:
+        # Keep unparseable numbers as scraped; they are just not used for matching
+        normalized[field] = normalize_phone(record.get(field, '')) or (record.get(field) or '').strip()
+    if normalized['home_phone'] == normalized['mobile_phone']:
+        normalized['home_phone'] = ''
+    if not normalized['phone_number']:
+        normalized['phone_number'] = normalized['mobile_phone'] or normalized['home_phone']
+
+    email = normalize_email(record.get('email', ''))
+    # Keep unparseable values (e.g. Cloudflare-obfuscated emails) as scraped
+    normalized['email'] = email or (record.get('email') or '').strip()
+    return normalized
+
+
+def choose_input_file(raw_file: str = INPUT_FILE, canonical_file: str = OUTPUT_FILE) -> str:
+    """Canonical records if they are at least as new as the raw scrape, else the raw CSV"""
+    chosen = raw_file
+    if os.path.exists(canonical_file):
+        if not os.path.exists(raw_file) or os.path.getmtime(canonical_file) >= os.path.getmtime(raw_file):
+            chosen = canonical_file
+        else:
+            logger.warning(f"{canonical_file} is older than {raw_file}; re-run dedupe.py to refresh it")
+    logger.info(f"📂 Using candidate data from {chosen}")
+    return chosen
+
+
+def personal_phones(record: Dict) -> Set[str]:
+    """Normalized mobile numbers of a record, usable as identity keys"""
+    phones = set()
+    for field in PHONE_FIELDS:
+        phone = normalize_phone(record.get(field, ''))
+        if not phone:
+            continue
+        if phone.startswith(f'+{AZ_COUNTRY_CODE}'):
+            if phone[4:6] in AZ_MOBILE_PREFIXES:
+                phones.add(phone)
+        elif field == 'mobile_phone':
+            # Line type of foreign numbers is unknown; trust the field label
+            phones.add(phone)
+    return phones
+
+
+class _UnionFind:
+    def __init__(self, size: int):
+        self.parent = list(range(size))
+
+    def find(self, i: int) -> int:
+        while self.parent[i] != i:
+            self.parent[i] = self.parent[self.parent[i]]
+            i = self.parent[i]
+        return i
+
+    def union(self, a: int, b: int):
+        root_a, root_b = self.find(a), self.find(b)
+        if root_a != root_b:
+            self.parent[max(root_a, root_b)] = min(root_a, root_b)
+
+
+def cluster_candidates(records: List[Dict]) -> List[List[int]]:
+    """Group record indexes that share a normalized mobile phone or email"""
+    phone_index = defaultdict(list)
+    email_index = defaultdict(list)
+    for i, record in enumerate(records):
+        for phone in personal_phones(record):
+            phone_index[phone].append(i)
+        email = normalize_email(record.get('email', ''))
+        if email:
+            email_index[email].append(i)
+
+    union_find = _UnionFind(len(records))
+    for index in (phone_index, email_index):
+        for members in index.values():
+            for other in members[1:]:
+                union_find.union(members[0], other)
+
+    clusters = defaultdict(list)
+    for i in range(len(records)):
+        clusters[union_find.find(i)].append(i)
+    return list(clusters.values())
+
+
+def _completeness(record: Dict) -> int:
+    return sum(1 for value in record.values() if value)
+
+
+def merge_cluster(records: List[Dict]) -> Dict:
+    """Merge duplicate records into one canonical record"""
+    ordered = sorted(records, key=_completeness, reverse=True)
+    canonical = dict(ordered[0])
+    for record in ordered[1:]:
+        for field, value in record.items():
+            if value and not canonical.get(field):
+                canonical[field] = value
+
+    canonical['duplicate_urls'] = ' | '.join(
+        record['url'] for record in ordered[1:] if record.get('url')
+    )
+    canonical['cluster_size'] = len(records)
+    return canonical
+
+
+def deduplicate(records: List[Dict]) -> List[Dict]:
+    """Normalize records and collapse duplicates into canonical records"""
+    normalized = [normalize_record(record) for record in records]
+    canonical = [merge_cluster([normalized[i] for i in cluster])
+                 for cluster in cluster_candidates(normalized)]
+    logger.info(f"🧹 {len(records)} records -> {len(canonical)} canonical candidates "
+                f"({len(records) - len(canonical)} duplicates merged)")
+    return canonical
+
+
+def main(input_file: str = INPUT_FILE, output_file: str = OUTPUT_FILE):
+    with open(input_file, 'r', newline='', encoding='utf-8') as csvfile:
+        reader = csv.DictReader(csvfile)
+        fieldnames = list(reader.fieldnames or [])
+        records = list(reader)
+
+    canonical = deduplicate(records)
+
+    fieldnames += [field for field in ('duplicate_urls', 'cluster_size') if field not in fieldnames]
+    with open(output_file, 'w', newline='', encoding='utf-8') as csvfile:
+        writer = csv.DictWriter(csvfile, fieldnames=fieldnames, extrasaction='ignore')
+        writer.writeheader()
+        writer.writerows(canonical)
+
+    logger.info(f"💾 Canonical records saved to {output_file}")
+
+
+if __name__ == "__main__":
+    main(*sys.argv[1:3])
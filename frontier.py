@@ -0,0 +1,117 @@
+"""
+Prioritized crawl frontier for busy.az profiles
+Scores jobseeker ids by the probability their profile changed since the last
+fetch, so a capped per-run request budget goes to the stalest profiles first
+"""
+
+import heapq
+import json
+import logging
+import math
+import os
+import time
+from typing import Dict, List, Optional
+
+from change_tracker import jobseeker_id
+
+logger = logging.getLogger(__name__)
+
+DAY = 86400.0
+
+# Prior for the change-rate estimate: one change per 30 days until observed otherwise
+PRIOR_CHANGES = 1.0
+PRIOR_DAYS = 30.0
+# Never-fetched profiles outrank any refresh
+UNFETCHED_SCORE = 1.0
+FAILURE_BACKOFF = 0.5
+
+
+class CrawlFrontier:
+    def __init__(self, path: str = 'busy_az_frontier.json'):
+        self.path = path
+        self.entries: Dict[str, Dict] = {}
+        self.load()
+
+    def load(self):
+        """Load the persisted frontier if present"""
+        if not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                self.entries = json.load(f)
+            logger.info(f"🧭 Loaded crawl frontier: {len(self.entries)} profiles")
+        except (OSError, ValueError) as e:
+            logger.error(f"Error loading crawl frontier {self.path}: {e}")
+            self.entries = {}
+
+    def save(self):
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.entries, f)
+        os.replace(tmp_path, self.path)
+
+    def discover(self, candidate_url: str, now: Optional[float] = None):
+        """Register a profile URL seen on a listing page"""
+        now = now or time.time()
+        entry = self.entries.setdefault(jobseeker_id(candidate_url), {
+            'url': candidate_url,
+            'first_seen': now,
+            'first_fetched': None,
+            'last_fetched': None,
+            'fetch_count': 0,
+            'change_count': 0,
+            'consecutive_failures': 0
+        })
+        entry['url'] = candidate_url
+        entry['last_listed'] = now
+
+    def record_fetch(self, candidate_url: str, changed: bool = False, ok: bool = True,
+                     now: Optional[float] = None):
+        """Record the outcome of fetching a profile"""
+        now = now or time.time()
+        self.discover(candidate_url, now)
+        entry = self.entries[jobseeker_id(candidate_url)]
+
+        if not ok:
+            entry['consecutive_failures'] += 1
+            return
+
+        if entry['first_fetched'] is None:
+            entry['first_fetched'] = now
+        elif changed:
+            entry['change_count'] += 1
+            entry['last_changed'] = now
+        entry['last_fetched'] = now
+        entry['fetch_count'] += 1
+        entry['consecutive_failures'] = 0
+
+    def change_rate(self, entry: Dict) -> float:
+        """Estimated changes per day, smoothed towards the prior"""
+        observed_days = 0.0
+        if entry.get('first_fetched') and entry.get('last_fetched'):
+            observed_days = (entry['last_fetched'] - entry['first_fetched']) / DAY
+        return (entry.get('change_count', 0) + PRIOR_CHANGES) / (observed_days + PRIOR_DAYS)
+
+    def score(self, entry: Dict, now: Optional[float] = None) -> float:
+        """Probability the profile changed since it was last fetched, backed off on failures"""
+        now = now or time.time()
+        if not entry.get('last_fetched'):
+            score = UNFETCHED_SCORE
+        else:
+            age_days = max(0.0, now - entry['last_fetched']) / DAY
+            # Poisson change model: P(at least one change during age_days)
+            score = 1.0 - math.exp(-self.change_rate(entry) * age_days)
+        return score * FAILURE_BACKOFF ** entry.get('consecutive_failures', 0)
+
+    def select(self, budget: int, now: Optional[float] = None) -> List[str]:
+        """URLs of the highest-priority profiles that fit in the budget"""
+        if budget <= 0:
+            return []
+        now = now or time.time()
+        ranked = heapq.nlargest(
+            budget,
+            self.entries.items(),
+            # Newer ids first on ties, matching the site's listing order
+            key=lambda item: (self.score(item[1], now), int(item[0]) if item[0].isdigit() else 0)
+        )
+        return [entry['url'] for _, entry in ranked]
@@ -5,22 +5,35 @@ Generates comprehensive business-focused visualizations
 
 import pandas as pd
 import numpy as np
-import matplotlib.pyplot as plt
-import seaborn as sns
-from matplotlib.ticker import FuncFormatter
+import argparse
+import json
+import os
 import re
 import warnings
+
+from dedupe import choose_input_file
+
 warnings.filterwarnings('ignore')
 
-# Set professional styling
-sns.set_style("whitegrid")
-plt.rcParams['figure.figsize'] = (12, 7)
-plt.rcParams['font.size'] = 10
-plt.rcParams['axes.titlesize'] = 14
-plt.rcParams['axes.labelsize'] = 11
+# Plotting libraries are only needed for the PNG charts, see setup_plotting()
+plt = None
+sns = None
+
+def setup_plotting():
+    """Import matplotlib/seaborn and set professional styling"""
+    global plt, sns
+    import matplotlib.pyplot as plt
+    import seaborn as sns
+
+    sns.set_style("whitegrid")
+    plt.rcParams['figure.figsize'] = (12, 7)
+    plt.rcParams['font.size'] = 10
+    plt.rcParams['axes.titlesize'] = 14
+    plt.rcParams['axes.labelsize'] = 11
 
-# Load data
-df = pd.read_csv('busy_az_candidates.csv')
+# Load data (prefer deduplicated records from dedupe.py unless they predate the scrape)
+DATA_FILE = choose_input_file()
+df = pd.read_csv(DATA_FILE)
 
 # Data cleaning and preparation
 def extract_numeric_salary(salary_str):
@@ -38,7 +51,17 @@ def extract_numeric_salary(salary_str):
         return np.mean(nums)
     return np.nan
 
-df['salary_numeric'] = df['salary_expectation'].apply(extract_numeric_salary)
+def load_structured(value):
+    """Decode a JSON list column written by the scraper"""
+    if pd.isna(value) or not value:
+        return []
+    return json.loads(value)
+
+# Prefer the typed columns emitted by the scraper; older CSVs only have free text
+if {'salary_min', 'salary_max'}.issubset(df.columns):
+    df['salary_numeric'] = df[['salary_min', 'salary_max']].mean(axis=1)
+else:
+    df['salary_numeric'] = df['salary_expectation'].apply(extract_numeric_salary)
 
 # Clean gender data
 df['gender_clean'] = df['gender'].fillna('Məlum deyil')
@@ -59,14 +82,22 @@ def extract_languages(lang_str):
         languages.append('Türk')
     return languages
 
-df['languages_list'] = df['languages'].apply(extract_languages)
+if 'languages_structured' in df.columns:
+    df['languages_list'] = df['languages_structured'].apply(
+        lambda value: [record['language'] for record in load_structured(value)]
+    )
+else:
+    df['languages_list'] = df['languages'].apply(extract_languages)
 
 # Chart 1: Gender Distribution
+def aggregate_gender_distribution():
+    return df['gender_clean'].value_counts()
+
 def chart_gender_distribution():
     """Gender distribution in candidate pool"""
     fig, ax = plt.subplots(figsize=(10, 6))
 
-    gender_counts = df['gender_clean'].value_counts()
+    gender_counts = aggregate_gender_distribution()
     colors = ['#2E86AB', '#A23B72', '#F18F01']
 
     bars = ax.barh(range(len(gender_counts)), gender_counts.values, color=colors[:len(gender_counts)])
@@ -88,15 +119,18 @@ def chart_gender_distribution():
     print("✓ Generated: Gender Distribution")
 
 # Chart 2: Top 15 In-Demand Positions
-def chart_top_positions():
-    """Most sought-after positions by candidates"""
-    fig, ax = plt.subplots(figsize=(12, 8))
-
+def aggregate_top_positions():
     # Filter out age entries that mistakenly appear as positions
     positions = df['position'].dropna()
     positions = positions[~positions.str.contains('yaş', na=False)]
 
-    top_positions = positions.value_counts().head(15)
+    return positions.value_counts().head(15)
+
+def chart_top_positions():
+    """Most sought-after positions by candidates"""
+    fig, ax = plt.subplots(figsize=(12, 8))
+
+    top_positions = aggregate_top_positions()
 
     bars = ax.barh(range(len(top_positions)), top_positions.values, color='#2E86AB')
     ax.set_yticks(range(len(top_positions)))
@@ -116,16 +150,29 @@ def chart_top_positions():
     print("✓ Generated: Top Positions")
 
 # Chart 3: Salary Expectations Distribution
-def chart_salary_distribution():
-    """Salary expectations among candidates"""
-    fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(16, 6))
-
-    # Left: Negotiable vs Specific
+def aggregate_salary_distribution():
+    # Negotiable vs Specific
     salary_category = df['salary_expectation'].apply(
         lambda x: 'Razılaşma əsasında' if pd.isna(x) or 'Razılaşma' in str(x) or str(x).strip() == 'AZN' else 'Konkret məbləğ'
     )
     cat_counts = salary_category.value_counts()
 
+    # Salary ranges for those who specified
+    salary_numeric = df['salary_numeric'].dropna()
+    salary_ranges = pd.cut(salary_numeric, bins=[0, 500, 1000, 1500, 2000, 10000],
+                           labels=['0-500 AZN', '500-1000 AZN', '1000-1500 AZN',
+                                  '1500-2000 AZN', '2000+ AZN'])
+    range_counts = salary_ranges.value_counts().sort_index()
+
+    return cat_counts, range_counts
+
+def chart_salary_distribution():
+    """Salary expectations among candidates"""
+    fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(16, 6))
+
+    cat_counts, range_counts = aggregate_salary_distribution()
+
+    # Left: Negotiable vs Specific
     colors = ['#F18F01', '#2E86AB']
     bars = ax1.bar(range(len(cat_counts)), cat_counts.values, color=colors)
     ax1.set_xticks(range(len(cat_counts)))
@@ -140,12 +187,6 @@ def chart_salary_distribution():
                 f'{value}\n({percentage:.1f}%)', ha='center', fontweight='bold')
 
     # Right: Salary ranges for those who specified
-    salary_numeric = df['salary_numeric'].dropna()
-    salary_ranges = pd.cut(salary_numeric, bins=[0, 500, 1000, 1500, 2000, 10000],
-                           labels=['0-500 AZN', '500-1000 AZN', '1000-1500 AZN',
-                                  '1500-2000 AZN', '2000+ AZN'])
-    range_counts = salary_ranges.value_counts().sort_index()
-
     bars = ax2.bar(range(len(range_counts)), range_counts.values, color='#A23B72')
     ax2.set_xticks(range(len(range_counts)))
     ax2.set_xticklabels(range_counts.index, rotation=45, ha='right')
@@ -163,8 +204,7 @@ def chart_salary_distribution():
     print("✓ Generated: Salary Distribution")
 
 # Chart 4: Average Salary by Top Positions
-def chart_salary_by_position():
-    """Average salary expectations by position"""
+def aggregate_salary_by_position():
     # Filter valid positions and salaries
     df_valid = df[df['salary_numeric'].notna()].copy()
     df_valid = df_valid[~df_valid['position'].str.contains('yaş', na=False)]
@@ -176,7 +216,11 @@ def chart_salary_by_position():
     df_filtered = df_valid[df_valid['position'].isin(valid_positions)]
 
     # Calculate average salary by position
-    avg_salary = df_filtered.groupby('position')['salary_numeric'].mean().sort_values(ascending=False).head(15)
+    return df_filtered.groupby('position')['salary_numeric'].mean().sort_values(ascending=False).head(15)
+
+def chart_salary_by_position():
+    """Average salary expectations by position"""
+    avg_salary = aggregate_salary_by_position()
 
     fig, ax = plt.subplots(figsize=(12, 8))
 
@@ -198,8 +242,7 @@ def chart_salary_by_position():
     print("✓ Generated: Salary by Position")
 
 # Chart 5: Language Skills Distribution
-def chart_language_skills():
-    """Language capabilities in candidate pool"""
+def aggregate_language_skills():
     # Count language occurrences
     all_languages = []
     for langs in df['languages_list']:
@@ -207,7 +250,11 @@ def chart_language_skills():
 
     from collections import Counter
     lang_counts = Counter(all_languages)
-    lang_df = pd.DataFrame.from_dict(lang_counts, orient='index', columns=['count']).sort_values('count', ascending=False)
+    return pd.DataFrame.from_dict(lang_counts, orient='index', columns=['count']).sort_values('count', ascending=False)
+
+def chart_language_skills():
+    """Language capabilities in candidate pool"""
+    lang_df = aggregate_language_skills()
 
     fig, ax = plt.subplots(figsize=(10, 6))
 
@@ -230,10 +277,7 @@ def chart_language_skills():
     print("✓ Generated: Language Skills")
 
 # Chart 6: Data Completeness Profile
-def chart_data_completeness():
-    """Profile completeness analysis"""
-    fig, ax = plt.subplots(figsize=(12, 8))
-
+def aggregate_data_completeness():
     # Calculate completeness for key fields
     fields = ['skills', 'languages', 'education', 'work_history', 'about']
     field_labels = ['Bacarıqlar', 'Dillər', 'Təhsil', 'İş təcrübəsi', 'Haqqında']
@@ -244,6 +288,14 @@ def chart_data_completeness():
         percentage = (complete / len(df)) * 100
         completeness.append(percentage)
 
+    return field_labels, completeness
+
+def chart_data_completeness():
+    """Profile completeness analysis"""
+    fig, ax = plt.subplots(figsize=(12, 8))
+
+    field_labels, completeness = aggregate_data_completeness()
+
     colors = ['#06A77D' if p >= 50 else '#F18F01' if p >= 30 else '#E63946' for p in completeness]
 
     bars = ax.barh(range(len(field_labels)), completeness, color=colors)
@@ -269,10 +321,7 @@ def chart_data_completeness():
     print("✓ Generated: Profile Completeness")
 
 # Chart 7: Contact Information Availability
-def chart_contact_availability():
-    """Contact information completeness"""
-    fig, ax = plt.subplots(figsize=(10, 6))
-
+def aggregate_contact_availability():
     contact_fields = {
         'Mobil telefon': df['mobile_phone'].notna().sum(),
         'Ev telefonu': df['home_phone'].notna().sum(),
@@ -283,6 +332,14 @@ def chart_contact_availability():
     values = list(contact_fields.values())
     percentages = [(v / len(df)) * 100 for v in values]
 
+    return categories, values, percentages
+
+def chart_contact_availability():
+    """Contact information completeness"""
+    fig, ax = plt.subplots(figsize=(10, 6))
+
+    categories, values, percentages = aggregate_contact_availability()
+
     bars = ax.bar(range(len(categories)), percentages, color=['#2E86AB', '#A23B72', '#06A77D'])
     ax.set_xticks(range(len(categories)))
     ax.set_xticklabels(categories)
@@ -302,8 +359,7 @@ def chart_contact_availability():
     print("✓ Generated: Contact Availability")
 
 # Chart 8: Position Categories
-def chart_position_categories():
-    """Candidate distribution by job category"""
+def aggregate_position_categories():
     # Categorize positions
     def categorize_position(pos):
         if pd.isna(pos):
@@ -334,7 +390,11 @@ def chart_position_categories():
             return 'Digər'
 
     df['category'] = df['position'].apply(categorize_position)
-    category_counts = df['category'].value_counts().head(10)
+    return df['category'].value_counts().head(10)
+
+def chart_position_categories():
+    """Candidate distribution by job category"""
+    category_counts = aggregate_position_categories()
 
     fig, ax = plt.subplots(figsize=(12, 7))
 
@@ -358,10 +418,7 @@ def chart_position_categories():
     print("✓ Generated: Position Categories")
 
 # Chart 9: Salary Negotiability by Gender
-def chart_salary_by_gender():
-    """Salary negotiation preferences by gender"""
-    fig, ax = plt.subplots(figsize=(12, 6))
-
+def aggregate_salary_by_gender():
     # Create salary category
     df['salary_type'] = df['salary_expectation'].apply(
         lambda x: 'Razılaşma əsasında' if pd.isna(x) or 'Razılaşma' in str(x) or str(x).strip() == 'AZN' else 'Konkret məbləğ'
@@ -375,6 +432,14 @@ def chart_salary_by_gender():
     if 'Kişi' in cross_tab_pct.index and 'Qadın' in cross_tab_pct.index:
         cross_tab_pct = cross_tab_pct.loc[['Kişi', 'Qadın']]
 
+    return cross_tab_pct
+
+def chart_salary_by_gender():
+    """Salary negotiation preferences by gender"""
+    fig, ax = plt.subplots(figsize=(12, 6))
+
+    cross_tab_pct = aggregate_salary_by_gender()
+
     cross_tab_pct.plot(kind='bar', ax=ax, color=['#F18F01', '#2E86AB'], width=0.7)
     ax.set_xlabel('Gender')
     ax.set_ylabel('Faiz (%)')
@@ -393,12 +458,15 @@ def chart_salary_by_gender():
     print("✓ Generated: Salary by Gender")
 
 # Chart 10: Multi-language Capability
-def chart_multilingual_candidates():
-    """Multilingual capabilities analysis"""
+def aggregate_multilingual_candidates():
     df['num_languages'] = df['languages_list'].apply(len)
 
     lang_counts = df['num_languages'].value_counts().sort_index()
-    lang_counts = lang_counts[lang_counts.index > 0]  # Exclude 0
+    return lang_counts[lang_counts.index > 0]  # Exclude 0
+
+def chart_multilingual_candidates():
+    """Multilingual capabilities analysis"""
+    lang_counts = aggregate_multilingual_candidates()
 
     fig, ax = plt.subplots(figsize=(10, 6))
 
@@ -420,8 +488,204 @@ def chart_multilingual_candidates():
     plt.close()
     print("✓ Generated: Multilingual Candidates")
 
+# HTML dashboard: the aggregates behind each chart as JSON, drawn client-side
+def bar_panel(title, axis_label, labels, values, annotations=None, orientation='vertical', unit=''):
+    """One bar chart panel in the dashboard JSON format"""
+    values = [round(float(v), 2) for v in values]
+    return {
+        'title': title,
+        'axis_label': axis_label,
+        'orientation': orientation,
+        'unit': unit,
+        'labels': [str(label) for label in labels],
+        'values': values,
+        'annotations': annotations or [f'{v:g}{unit}' for v in values]
+    }
+
+def share_labels(values, total):
+    return [f'{v} ({(v / total) * 100:.1f}%)' for v in values]
+
+# Headings for charts drawn as several panels; single-panel charts use the panel title
+MULTI_PANEL_TITLES = {
+    '03_salary_distribution': 'Maaş gözləntiləri',
+    '09_salary_by_gender': 'Maaş göstərmə meyli: Gender üzrə müqayisə'
+}
+
+def dashboard_aggregates():
+    """Chart id -> panels holding the same aggregates as the PNG charts"""
+    total = len(df)
+
+    gender_counts = aggregate_gender_distribution()
+    top_positions = aggregate_top_positions()
+    cat_counts, range_counts = aggregate_salary_distribution()
+    avg_salary = aggregate_salary_by_position()
+    lang_df = aggregate_language_skills()
+    field_labels, completeness = aggregate_data_completeness()
+    categories, contact_values, contact_percentages = aggregate_contact_availability()
+    category_counts = aggregate_position_categories()
+    cross_tab_pct = aggregate_salary_by_gender()
+    multilingual_counts = aggregate_multilingual_candidates()
+
+    return {
+        '01_gender_distribution': [bar_panel(
+            'Namizəd bazasında gender tərkibi', 'Namizədlərin sayı', gender_counts.index,
+            gender_counts.values, share_labels(gender_counts.values, total), 'horizontal')],
+        '02_top_positions': [bar_panel(
+            'Ən çox axtarılan TOP 15 vəzifə', 'Namizəd sayı', top_positions.index,
+            top_positions.values, orientation='horizontal')],
+        '03_salary_distribution': [
+            bar_panel('Maaş gözləntisi: Razılaşma vs Konkret məbləğ', 'Namizəd sayı', cat_counts.index,
+                      cat_counts.values, share_labels(cat_counts.values, total)),
+            bar_panel('Maaş intervalları (konkret məbləğ göstərənlər)', 'Namizəd sayı', range_counts.index,
+                      range_counts.values)
+        ],
+        '04_salary_by_position': [bar_panel(
+            'Vəzifələr üzrə orta maaş gözləntisi (TOP 15)', 'Orta maaş gözləntisi (AZN)', avg_salary.index,
+            avg_salary.values, [f'{v:.0f} AZN' for v in avg_salary.values], 'horizontal')],
+        '05_language_skills': [bar_panel(
+            'Namizədlərin dil bilikləri', 'Namizəd sayı', lang_df.index,
+            lang_df['count'].values, share_labels(lang_df['count'].values, total))],
+        '06_profile_completeness': [bar_panel(
+            'Namizəd profilinin dolulluq dərəcəsi', 'Doldurulma faizi (%)', field_labels,
+            completeness, [f'{v:.1f}%' for v in completeness], 'horizontal', '%')],
+        '07_contact_availability': [bar_panel(
+            'Əlaqə məlumatlarının mövcudluğu', 'Doldurulma faizi (%)', categories, contact_percentages,
+            [f'{p:.1f}% ({c})' for p, c in zip(contact_percentages, contact_values)], unit='%')],
+        '08_position_categories': [bar_panel(
+            'Namizədlərin sahələr üzrə paylanması', 'Namizəd sayı', category_counts.index,
+            category_counts.values, share_labels(category_counts.values, total), 'horizontal')],
+        '09_salary_by_gender': [
+            bar_panel(f'Maaş göstərmə meyli: {gender}', 'Faiz (%)', cross_tab_pct.columns,
+                      cross_tab_pct.loc[gender].values, [f'{v:.1f}%' for v in cross_tab_pct.loc[gender].values],
+                      unit='%')
+            for gender in cross_tab_pct.index
+        ],
+        '10_multilingual_candidates': [bar_panel(
+            'Namizədlərin çoxdillilik göstəriciləri', 'Namizəd sayı',
+            [f'{int(idx)} dil' for idx in multilingual_counts.index], multilingual_counts.values,
+            share_labels(multilingual_counts.values, multilingual_counts.sum()))]
+    }
+
+DASHBOARD_HTML = """<!DOCTYPE html>
+<html lang="az">
+<head>
+<meta charset="utf-8">
+<title>Busy.az namizəd bazası</title>
+<style>
+  body { font-family: -apple-system, "Segoe UI", Roboto, sans-serif; margin: 2rem auto; max-width: 1100px; color: #222; }
+  h1 { font-size: 1.6rem; }
+  .chart { border: 1px solid #e3e3e3; border-radius: 6px; padding: 1rem 1.25rem; margin-bottom: 1.5rem; }
+  .chart h2 { font-size: 1.1rem; margin: 0 0 .75rem; }
+  .axis { color: #666; font-size: .8rem; margin-top: .5rem; }
+  .row { display: flex; align-items: center; margin: 3px 0; font-size: .85rem; }
+  .row .label { width: 35%; padding-right: .5rem; text-align: right; overflow: hidden; text-overflow: ellipsis; white-space: nowrap; }
+  .row .track { flex: 1; }
+  .row .bar { height: 18px; border-radius: 2px; display: inline-block; vertical-align: middle; }
+  .row .value { margin-left: .4rem; font-weight: bold; }
+  .columns { display: flex; align-items: flex-end; height: 220px; gap: 12px; font-size: .8rem; }
+  .column { flex: 1; display: flex; flex-direction: column; justify-content: flex-end; align-items: center; height: 100%; text-align: center; }
+  .column .bar { width: 70%; border-radius: 2px 2px 0 0; }
+  .column .value { font-weight: bold; margin-bottom: 2px; }
+  .column .label { margin-top: 4px; min-height: 2.4em; }
+</style>
+</head>
+<body>
+<h1>Busy.az namizəd bazası — biznes analitika paneli</h1>
+<div id="charts"></div>
+<script>
+const COLORS = ['#2E86AB', '#A23B72', '#F18F01', '#06A77D', '#E63946'];
+
+function el(tag, className, text) {
+  const node = document.createElement(tag);
+  if (className) node.className = className;
+  if (text !== undefined) node.textContent = text;
+  return node;
+}
+
+function renderPanel(panel, color, showTitle) {
+  const box = el('div');
+  if (showTitle) box.appendChild(el('h3', null, panel.title));
+  const max = panel.unit === '%' ? 100 : Math.max(...panel.values, 1);
+  if (panel.orientation === 'horizontal') {
+    panel.labels.forEach((label, i) => {
+      const row = el('div', 'row');
+      row.appendChild(el('div', 'label', label)).title = label;
+      const track = row.appendChild(el('div', 'track'));
+      const bar = track.appendChild(el('span', 'bar'));
+      bar.style.width = (75 * panel.values[i] / max) + '%';
+      bar.style.background = color;
+      track.appendChild(el('span', 'value', panel.annotations[i]));
+      box.appendChild(row);
+    });
+  } else {
+    const columns = box.appendChild(el('div', 'columns'));
+    panel.labels.forEach((label, i) => {
+      const column = columns.appendChild(el('div', 'column'));
+      column.appendChild(el('div', 'value', panel.annotations[i]));
+      const bar = column.appendChild(el('div', 'bar'));
+      bar.style.height = (80 * panel.values[i] / max) + '%';
+      bar.style.background = COLORS[i % COLORS.length];
+      column.appendChild(el('div', 'label', label));
+    });
+  }
+  box.appendChild(el('div', 'axis', panel.axis_label));
+  return box;
+}
+
+async function main() {
+  const container = document.getElementById('charts');
+  const manifest = await (await fetch('data/index.json')).json();
+  const charts = await Promise.all(manifest.charts.map(id => fetch('data/' + id + '.json').then(r => r.json())));
+  charts.forEach((chart, i) => {
+    const section = container.appendChild(el('section', 'chart'));
+    section.appendChild(el('h2', null, chart.title));
+    chart.panels.forEach(panel =>
+      section.appendChild(renderPanel(panel, COLORS[i % COLORS.length], chart.panels.length > 1)));
+  });
+}
+
+main().catch(error => {
+  document.getElementById('charts').textContent =
+    'Could not load dashboard data (' + error + '). Serve this directory over HTTP, e.g. python -m http.server';
+});
+</script>
+</body>
+</html>
+"""
+
+def generate_dashboard(output_dir='dashboard'):
+    """Write one JSON file per chart plus a static HTML page that draws them"""
+    data_dir = os.path.join(output_dir, 'data')
+    os.makedirs(data_dir, exist_ok=True)
+
+    aggregates = dashboard_aggregates()
+    for chart_id, panels in aggregates.items():
+        chart = {'title': MULTI_PANEL_TITLES.get(chart_id, panels[0]['title']), 'panels': panels}
+        with open(os.path.join(data_dir, f'{chart_id}.json'), 'w', encoding='utf-8') as f:
+            json.dump(chart, f, ensure_ascii=False, separators=(',', ':'))
+
+    with open(os.path.join(data_dir, 'index.json'), 'w', encoding='utf-8') as f:
+        json.dump({'source': DATA_FILE, 'candidates': len(df), 'charts': list(aggregates)}, f, ensure_ascii=False)
+
+    with open(os.path.join(output_dir, 'index.html'), 'w', encoding='utf-8') as f:
+        f.write(DASHBOARD_HTML)
+
+    print(f"✓ Dashboard written to {output_dir}/ (serve with: python -m http.server -d {output_dir})")
+
 # Main execution
 def main():
+    parser = argparse.ArgumentParser(description='Generate busy.az candidate analytics')
+    parser.add_argument('--html', action='store_true',
+                        help='Write JSON aggregates and a static HTML dashboard instead of PNG charts')
+    parser.add_argument('--output-dir', default='dashboard', help='Dashboard directory for --html')
+    args = parser.parse_args()
+
+    if args.html:
+        generate_dashboard(args.output_dir)
+        return
+
+    setup_plotting()
+
     print("\n" + "="*60)
     print("BUSY.AZ CANDIDATE DATABASE - BUSINESS INTELLIGENCE DASHBOARD")
     print("="*60 + "\n")
@@ -0,0 +1,241 @@
+"""
+Deterministic mock busy.az server
+Serves generated /jobseekers?page=N listings and /jobseeker/<id> profiles with
+configurable latency, error and rate-limit behaviour for offline load tests
+"""
+
+import argparse
+import asyncio
+import html
+import logging
+import math
+import random
+from collections import Counter
+from typing import Dict, List
+
+from aiohttp import web
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+FIRST_NAMES = ['Əli', 'Rauf', 'Nigar', 'Aysel', 'Murad', 'Günay', 'Samir', 'Leyla', 'Orxan', 'Şəbnəm',
+               'Tural', 'Çinarə', 'Vüqar', 'Ülviyyə', 'Kamran', 'Fidan']
+LAST_NAMES = ['Məmmədov', 'Həsənov', 'Əliyeva', 'Quliyev', 'İsmayılova', 'Hüseynov', 'Cəfərov', 'Ağayeva']
+POSITIONS = ['satış meneceri', 'mühasib', 'sürücü', 'ingilis dili müəllimi', 'proqramçı', 'SMM manager',
+             'data analyst', 'aşpaz', 'HR mütəxəssisi', 'hüquqşünas', 'dizayner', 'ofis meneceri']
+SKILLS = ['MS Office', '1C', 'Excel', 'Python', 'SQL', 'Photoshop', 'Satış', 'Kommunikasiya', 'SMM',
+          'Mühasibat uçotu', 'Sürücülük vəsiqəsi B']
+LANGUAGES = ['Azərbaycan', 'İngilis', 'Rus', 'Türk', 'Alman']
+LEVELS = ['A2 – Zəif (Elementary)', 'B1 – Orta (Intermediate)', 'B2 – Ortadan üstün (Upper Intermediate)',
+          'C1 – Qabaqcıl (Advanced)', 'C2 – Mükəmməl (Proficiency)']
+INSTITUTIONS = ['Bakı Dövlət Universiteti', 'Azərbaycan Dövlət İqtisad Universiteti',
+                'Azərbaycan Texniki Universiteti', 'Bakı Biznes Universiteti']
+EMPLOYERS = ['Buta Agro', '158 Taxi', 'Kapital Bank', 'Bravo', 'Azercell', 'PASHA Holding']
+CITIES = ['Bakı', 'Sumqayıt', 'Gəncə']
+SALARIES = ['Razılaşma əsasında'] * 6 + ['500.00   AZN', '800.00   AZN', '1000.00   AZN',
+                                          '500.00-1000.00  AZN', '1200.00-2000.00  AZN', '800.00-  AZN']
+
+
+class MockBusyAzServer:
+    def __init__(self, pages: int = 20, per_page: int = 20, seed: int = 42,
+                 latency: str = 'lognormal', latency_ms: float = 50.0, latency_sigma: float = 0.5,
+                 error_rate: float = 0.0, rate_limit_rate: float = 0.0, not_found_rate: float = 0.0):
+        self.pages = pages
+        self.per_page = per_page
+        self.seed = seed
+        self.latency = latency
+        self.latency_ms = latency_ms
+        self.latency_sigma = latency_sigma
+        self.error_rate = error_rate
+        self.rate_limit_rate = rate_limit_rate
+        self.not_found_rate = not_found_rate
+        self.first_id = pages * per_page + 1000
+        self.hits = Counter()
+        self.status_counts = Counter()
+        self.runner = None
+
+    def create_app(self) -> web.Application:
+        app = web.Application()
+        app.router.add_get('/jobseekers', self.handle_listing)
+        app.router.add_get(r'/jobseeker/{candidate_id:\d+}', self.handle_profile)
+        return app
+
+    def _request_rng(self, path: str) -> random.Random:
+        """RNG keyed on path and attempt number, so retries see a fresh but reproducible outcome"""
+        attempt = self.hits[path]
+        self.hits[path] += 1
+        return random.Random(f"{self.seed}:{path}:{attempt}")
+
+    def _delay(self, rng: random.Random) -> float:
+        if self.latency == 'fixed':
+            return self.latency_ms / 1000
+        if self.latency == 'uniform':
+            return rng.uniform(0, 2 * self.latency_ms) / 1000
+        # Log-normal with the configured median, which gives a realistic long tail
+        return rng.lognormvariate(math.log(self.latency_ms), self.latency_sigma) / 1000
+
+    async def _simulate(self, path: str):
+        """Apply latency and injected failures; return the request RNG and an error response or None"""
+        rng = self._request_rng(path)
+        await asyncio.sleep(self._delay(rng))
+
+        roll = rng.random()
+        if roll < self.rate_limit_rate:
+            return rng, self._respond(web.Response(status=429, headers={'Retry-After': '1'}, text='Too Many Requests'))
+        if roll < self.rate_limit_rate + self.error_rate:
+            return rng, self._respond(web.Response(status=500, text='Internal Server Error'))
+        return rng, None
+
+    def _respond(self, response: web.Response) -> web.Response:
+        self.status_counts[response.status] += 1
+        return response
+
+    def candidate_ids(self, page: int) -> List[int]:
+        if page < 1 or page > self.pages:
+            return []
+        start = self.first_id - (page - 1) * self.per_page
+        return [start - i for i in range(self.per_page)]
+
+    async def handle_listing(self, request: web.Request) -> web.Response:
+        try:
+            page = int(request.query.get('page', '1'))
+        except ValueError:
+            page = 1
+        _, error = await self._simulate(f"/jobseekers?page={page}")
+        if error:
+            return error
+
+        links = ''.join(
+            f'<div class="freelancer"><a href="/jobseeker/{candidate_id}">Namizəd {candidate_id}</a></div>'
+            for candidate_id in self.candidate_ids(page)
+        )
+        pagination = ''.join(
+            f'<li><a href="/jobseekers?page={n}">{n}</a></li>' for n in range(1, self.pages + 1)
+        )
+        body = (f'<html><body><div class="freelancers-container">{links}</div>'
+                f'<ul class="pagination">{pagination}</ul></body></html>')
+        return self._respond(web.Response(text=body, content_type='text/html'))
+
+    async def handle_profile(self, request: web.Request) -> web.Response:
+        candidate_id = int(request.match_info['candidate_id'])
+        rng, error = await self._simulate(f"/jobseeker/{candidate_id}")
+        if error:
+            return error
+
+        if random.Random(f"{self.seed}:exists:{candidate_id}").random() < self.not_found_rate:
+            return self._respond(web.Response(status=404, text='Not Found'))
+        # Like the real site, each response carries a fresh CSRF token
+        body = self.render_profile(candidate_id, csrf_token=f"{rng.getrandbits(64):x}")
+        return self._respond(web.Response(text=body, content_type='text/html'))
+
+    def profile_data(self, candidate_id: int) -> Dict:
+        """Deterministic candidate data for an id"""
+        rng = random.Random(f"{self.seed}:profile:{candidate_id}")
+        start_year = rng.randint(2005, 2020)
+        return {
+            'name': f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}",
+            'position': rng.choice(POSITIONS),
+            'mobile_phone': f"+99450{rng.randint(1000000, 9999999)}",
+            'home_phone': f"+99412{rng.randint(1000000, 9999999)}" if rng.random() < 0.4 else '',
+            'gender': rng.choice(['Kişi', 'Qadın']),
+            'salary': rng.choice(SALARIES),
+            'skills': rng.sample(SKILLS, rng.randint(0, 4)),
+            'desired_positions': rng.sample(POSITIONS, rng.randint(0, 2)),
+            'languages': [(language, rng.choice(LEVELS)) for language in rng.sample(LANGUAGES, rng.randint(1, 3))],
+            'education': [(rng.choice(INSTITUTIONS), f"09/{start_year}", f"07/{start_year + 4}", rng.choice(CITIES))],
+            'work_history': [
+                (rng.choice(POSITIONS), rng.choice(EMPLOYERS), f"0{rng.randint(1, 9)}/{start_year + 5}",
+                 'indiyə qədər', rng.choice(CITIES), 'Vəzifə öhdəlikləri.')
+                for _ in range(rng.randint(0, 2))
+            ],
+            'about': 'Məsuliyyətli və komandada işləməyi bacaran namizəd. ' * rng.randint(1, 4)
+        }
+
+    def render_profile(self, candidate_id: int, csrf_token: str = '') -> str:
+        """Profile page using the same markup the scraper parses on busy.az"""
+        data = self.profile_data(candidate_id)
+        e = html.escape
+
+        table_rows = [('Mobil telefon', data['mobile_phone']), ('Ev telefonu', data['home_phone']),
+                      ('E-mail', '[email protected]'), ('Cinsi', data['gender']), ('Maaş', data['salary'])]
+        table = ''.join(f'<tr><th>{e(th)}</th><td>{e(td)}</td></tr>' for th, td in table_rows if td)
+        skills = ''.join(f'<span>{e(skill)}</span>' for skill in data['skills'])
+        desired = ''.join(f'<span>{e(position)}</span>' for position in data['desired_positions'])
+        languages = ''.join(f'<li>{e(language)}\n\t\t-\n\t\t{e(level)}</li>' for language, level in data['languages'])
+        education = ''.join(
+            f'<li><h4>{e(institution)}</h4><span>{start} -  {end}</span><span>Azərbaycan\n\t\t{e(city)}</span></li>'
+            for institution, start, end, city in data['education']
+        )
+        work_history = ''.join(
+            f'<li><h4>{e(title)}</h4><span>{e(employer)}</span><span>{start} -  {end}</span>'
+            f'<span>Azərbaycan\n\t\t{e(city)}</span><p>{e(description)}</p></li>'
+            for title, employer, start, end, city, description in data['work_history']
+        )
+
+        return f"""<html><head><meta name="csrf-token" content="{csrf_token}"></head><body>
+<div class="single-page-header"><h3>{e(data['name'])}</h3>
+<p class="header-under-name">{e(data['position'])}</p></div>
+<div class="sidebar-container"><table>{table}</table>
+<div class="sidebar-widget"><h3>Bilik və bacarıqlar</h3><div class="task-tags">{skills}</div></div>
+<div class="sidebar-widget"><h3>İstədiyi ixtisaslar</h3><div class="task-tags">{desired}</div></div></div>
+<div class="single-page-section"><h3>Haqqında</h3><p>{e(data['about'])}</p></div>
+<div class="boxed-list"><h3>Dil bilikləri</h3><ul>{languages}</ul></div>
+<div class="boxed-list"><h3>Təhsil</h3><ul>{education}</ul></div>
+<div class="boxed-list"><h3>İş tarixçəsi</h3><ul>{work_history}</ul></div>
+</body></html>"""
+
+    async def start(self, host: str = '127.0.0.1', port: int = 8080):
+        self.runner = web.AppRunner(self.create_app(), access_log=None)
+        await self.runner.setup()
+        await web.TCPSite(self.runner, host, port).start()
+        logger.info(f"🧪 Mock busy.az serving {self.pages} pages x {self.per_page} candidates on http://{host}:{port}")
+
+    async def stop(self):
+        if self.runner:
+            await self.runner.cleanup()
+            self.runner = None
+
+
+def add_server_arguments(parser: argparse.ArgumentParser):
+    parser.add_argument('--pages', type=int, default=20)
+    parser.add_argument('--per-page', type=int, default=20)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--latency', choices=['fixed', 'uniform', 'lognormal'], default='lognormal')
+    parser.add_argument('--latency-ms', type=float, default=50.0, help='Fixed/mean/median latency')
+    parser.add_argument('--latency-sigma', type=float, default=0.5, help='Log-normal shape parameter')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='Fraction of requests answered with 500')
+    parser.add_argument('--rate-limit-rate', type=float, default=0.0, help='Fraction of requests answered with 429')
+    parser.add_argument('--not-found-rate', type=float, default=0.0, help='Fraction of profiles returning 404')
+
+
+def server_from_args(args: argparse.Namespace) -> MockBusyAzServer:
+    return MockBusyAzServer(
+        pages=args.pages, per_page=args.per_page, seed=args.seed,
+        latency=args.latency, latency_ms=args.latency_ms, latency_sigma=args.latency_sigma,
+        error_rate=args.error_rate, rate_limit_rate=args.rate_limit_rate, not_found_rate=args.not_found_rate
+    )
+
+
+async def serve_forever(server: MockBusyAzServer, host: str, port: int):
+    await server.start(host, port)
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await server.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Run a deterministic mock busy.az server')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8080)
+    add_server_arguments(parser)
+    args = parser.parse_args()
+
+    try:
+        asyncio.run(serve_forever(server_from_args(args), args.host, args.port))
+    except KeyboardInterrupt:
+        print("\n🛑 Mock server stopped")
+
+
+if __name__ == "__main__":
+    main()
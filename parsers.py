@@ -0,0 +1,148 @@
+"""
+Structured parsers for busy.az profile sections
+Turn the text of salary, language, education and work-history entries into
+typed sub-records so analytics never has to re-parse free text
+"""
+
+import re
+from typing import Dict, List, Optional
+
+_WHITESPACE_PATTERN = re.compile(r'\s+')
+_LOCATION_SPLIT_PATTERN = re.compile(r'\s*[\n,]\s*')
+_NUMBER_PATTERN = re.compile(r'\d+(?:\.\d+)?')
+_CURRENCY_PATTERN = re.compile(r'\b(AZN|USD|EUR|RUB|TRY)\b')
+_LANGUAGE_PATTERN = re.compile(
+    r'^(?P<language>[^-–]*?)\s*-\s*(?:(?P<level>[ABC][12])\s*[–-]?\s*)?(?P<label>.*)$'
+)
+# The separator and end are optional: entries may list only a start date
+_DATE_RANGE_PATTERN = re.compile(
+    r'(?=\d{2}/\d{4}|-)(?P<start>\d{2}/\d{4})?\s*(?:-\s*(?P<end>\d{2}/\d{4}|indiyə qədər)?)?'
+)
+_DATE_PATTERN = re.compile(r'\d{2}/\d{4}')
+
+NEGOTIABLE_MARKER = 'Razılaşma'
+PRESENT_MARKER = 'indiyə qədər'
+
+
+def _clean(text: str) -> str:
+    return _WHITESPACE_PATTERN.sub(' ', text or '').strip()
+
+
+def _month(date_str: Optional[str]) -> str:
+    """Convert MM/YYYY to YYYY-MM"""
+    if not date_str or not _DATE_PATTERN.fullmatch(date_str):
+        return ''
+    month, year = date_str.split('/')
+    return f'{year}-{month}'
+
+
+def _placeholder(text: str) -> str:
+    """Profiles use a lone '-' for fields the candidate left empty"""
+    text = _clean(text)
+    return '' if text == '-' else text
+
+
+def parse_salary(salary_text: str) -> Dict:
+    """Parse salary text such as '500.00-1000.00  AZN' into min/max/currency"""
+    salary_text = salary_text or ''
+    numbers = [float(n) for n in _NUMBER_PATTERN.findall(salary_text)]
+    currency_match = _CURRENCY_PATTERN.search(salary_text)
+
+    salary_min = salary_max = None
+    if len(numbers) >= 2:
+        salary_min, salary_max = min(numbers[:2]), max(numbers[:2])
+    elif len(numbers) == 1:
+        salary_min = numbers[0]
+        # '800.00-  AZN' is an open-ended range, a bare amount is exact
+        if not re.search(r'\d\s*-', salary_text):
+            salary_max = numbers[0]
+
+    return {
+        'salary_min': salary_min,
+        'salary_max': salary_max,
+        'salary_currency': currency_match.group(1) if currency_match else '',
+        'salary_negotiable': NEGOTIABLE_MARKER in salary_text or not numbers
+    }
+
+
+def parse_language(text: str) -> Optional[Dict]:
+    """Parse 'İngilis - B1 – Orta (Intermediate)' into language and level"""
+    text = _clean(text)
+    if not text:
+        return None
+
+    match = _LANGUAGE_PATTERN.match(text)
+    language = match.group('language').strip() if match else text
+    # Empty entries render as '-' and unknown languages as a bare numeric id
+    if not any(ch.isalpha() for ch in language):
+        return None
+    return {
+        'language': language,
+        'level': (match.group('level') or '') if match else '',
+        'level_label': match.group('label').strip() if match else ''
+    }
+
+
+def _split_dated_entry(parts: List[str]) -> Optional[Dict]:
+    """Split an entry's text nodes around its 'MM/YYYY - MM/YYYY' node"""
+    parts = [part for part in (p.strip() for p in parts) if part]
+    if not parts:
+        return None
+
+    date_index = next(
+        (i for i, part in enumerate(parts)
+         if _DATE_PATTERN.search(part) or PRESENT_MARKER in part),
+        None
+    )
+    if date_index is None:
+        return {'head': [_placeholder(p) for p in parts[:1]], 'start': '', 'end': '',
+                'current': False, 'location': [], 'details': ' '.join(_clean(p) for p in parts[1:])}
+
+    date_match = _DATE_RANGE_PATTERN.search(parts[date_index])
+    end = date_match.group('end') if date_match else None
+    tail = parts[date_index + 1:]
+    location = [_clean(line) for line in _LOCATION_SPLIT_PATTERN.split(tail[0]) if _clean(line)] if tail else []
+
+    return {
+        'head': [_placeholder(p) for p in parts[:date_index]],
+        'start': _month(date_match.group('start') if date_match else None),
+        'end': _month(end),
+        'current': end == PRESENT_MARKER,
+        'location': location,
+        'details': ' '.join(_clean(p) for p in tail[1:])
+    }
+
+
+def parse_education(parts: List[str]) -> Optional[Dict]:
+    """Parse the text nodes of an education entry"""
+    entry = _split_dated_entry(parts)
+    if not entry:
+        return None
+    head = entry['head']
+    return {
+        'institution': head[0] if head else '',
+        'start': entry['start'],
+        'end': entry['end'],
+        'current': entry['current'],
+        'country': entry['location'][0] if entry['location'] else '',
+        'city': ' '.join(entry['location'][1:]),
+        'details': ' '.join(head[1:] + [entry['details']]).strip()
+    }
+
+
+def parse_work_history(parts: List[str]) -> Optional[Dict]:
+    """Parse the text nodes of a work-history entry"""
+    entry = _split_dated_entry(parts)
+    if not entry:
+        return None
+    head = entry['head']
+    return {
+        'title': head[0] if head else '',
+        'employer': head[1] if len(head) > 1 else '',
+        'start': entry['start'],
+        'end': entry['end'],
+        'current': entry['current'],
+        'country': entry['location'][0] if entry['location'] else '',
+        'city': ' '.join(entry['location'][1:]),
+        'description': entry['details']
+    }
@@ -1,22 +1,50 @@
+import argparse
 import asyncio
 import aiohttp
 from bs4 import BeautifulSoup
 import csv
 import re
-from urllib.parse import urljoin
+from urllib.parse import urljoin, urlparse
 import logging
+import os
 from typing import List, Dict, Optional
 import time
 import signal
 import sys
 
+from change_tracker import ChangeTracker, hash_html, jobseeker_id
+from frontier import CrawlFrontier
+from parsers import parse_education, parse_language, parse_salary, parse_work_history
+from sinks import CANDIDATE_FIELDS, SINK_TYPES, ExportPipeline, create_sink, flatten_record, unflatten_record
+
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+# Bump when parse_candidate_html output changes so cached records are re-parsed
+PARSER_VERSION = 4
+DEFAULT_BASE_URL = "https://busy.az"
+
+def default_state_dir(base_url: str) -> str:
+    """Directory for the output CSV and crawl state; other hosts never touch busy.az state"""
+    host = urlparse(base_url).netloc
+    if host in ('busy.az', 'www.busy.az'):
+        return '.'
+    return os.path.join('runs', re.sub(r'[^\w.-]', '_', host))
+
 class BusyAzFullScraper:
-    def __init__(self, max_concurrent=8):
-        self.base_url = "https://busy.az"
+    def __init__(self, max_concurrent=8, tracker: Optional[ChangeTracker] = None,
+                 base_url: str = DEFAULT_BASE_URL, output_file: str = 'busy_az_candidates.csv',
+                 batch_delay: float = 0.8, page_delay: float = 1.5, trace_configs: Optional[List] = None,
+                 frontier: Optional[CrawlFrontier] = None, pipeline: Optional[ExportPipeline] = None):
+        self.base_url = base_url.rstrip('/')
         self.max_concurrent = max_concurrent
+        self.tracker = tracker
+        self.frontier = frontier
+        self.pipeline = pipeline
+        self.output_file = output_file
+        self.batch_delay = batch_delay
+        self.page_delay = page_delay
+        self.trace_configs = trace_configs or []
         self.semaphore = asyncio.Semaphore(max_concurrent)
         self.scraped_candidates = []
         self.total_candidates = 0
@@ -44,7 +72,8 @@ class BusyAzFullScraper:
         return aiohttp.ClientSession(
             headers=headers, 
             connector=connector, 
-            timeout=timeout
+            timeout=timeout,
+            trace_configs=self.trace_configs
         )
     
     async def get_total_pages(self, session: aiohttp.ClientSession) -> int:
@@ -116,6 +145,128 @@ class BusyAzFullScraper:
                 logger.error(f"Error fetching page {page}: {e}")
                 return []
     
+    def parse_candidate_html(self, html: str, candidate_url: str) -> Dict:
+        """Parse a candidate profile page into a flat record"""
+        soup = BeautifulSoup(html, 'html.parser')
+        
+        data = {
+            'phone_number': '',
+            'name': '',
+            'position': '',
+            'mobile_phone': '',
+            'home_phone': '',
+            'email': '',
+            'gender': '',
+            'salary_expectation': '',
+            'skills': '',
+            'languages': '',
+            'education': '',
+            'work_history': '',
+            'about': '',
+            'desired_positions': '',
+            'url': candidate_url,
+            'salary_min': None,
+            'salary_max': None,
+            'salary_currency': '',
+            'salary_negotiable': True,
+            'languages_structured': [],
+            'education_structured': [],
+            'work_history_structured': []
+        }
+        
+        # Extract name
+        name_elem = soup.find('h3')
+        if name_elem:
+            data['name'] = name_elem.get_text(strip=True)
+        
+        # Extract position
+        position_elem = soup.find('p', class_='header-under-name')
+        if position_elem:
+            data['position'] = position_elem.get_text(strip=True)
+        
+        # Extract personal information from sidebar tables
+        tables = soup.find_all('table')
+        for table in tables:
+            rows = table.find_all('tr')
+            for row in rows:
+                th = row.find('th')
+                td = row.find('td')
+                if th and td:
+                    field_name = th.get_text(strip=True).lower()
+                    field_value = td.get_text(strip=True)
+        
+                    if 'mobil telefon' in field_name:
+                        data['mobile_phone'] = field_value
+                        if not data['phone_number']:
+                            data['phone_number'] = field_value
+                    elif 'ev telefonu' in field_name:
+                        data['home_phone'] = field_value
+                        if not data['phone_number']:
+                            data['phone_number'] = field_value
+                    elif 'e-mail' in field_name:
+                        data['email'] = field_value
+                    elif 'cins' in field_name:
+                        data['gender'] = field_value
+                    elif 'maaş' in field_name:
+                        data['salary_expectation'] = field_value
+        
+        data.update(parse_salary(data['salary_expectation']))
+        
+        # Extract skills and desired positions from sidebar
+        sidebar_widgets = soup.find_all('div', class_='sidebar-widget')
+        for widget in sidebar_widgets:
+            h3 = widget.find('h3')
+            if h3:
+                h3_text = h3.get_text().lower()
+                task_tags = widget.find('div', class_='task-tags')
+                if task_tags:
+                    if 'bilik' in h3_text or 'bacarıq' in h3_text:
+                        skills = [span.get_text(strip=True) for span in task_tags.find_all('span')]
+                        data['skills'] = ', '.join(skills)
+                    elif 'ixtisas' in h3_text and 'istədiyi' in h3_text:
+                        positions = [span.get_text(strip=True) for span in task_tags.find_all('span')]
+                        data['desired_positions'] = ', '.join(positions)
+        
+        # Extract languages, education, work history from boxed lists
+        boxed_lists = soup.find_all('div', class_='boxed-list')
+        for boxed_list in boxed_lists:
+            headline = boxed_list.find('h3')
+            if headline:
+                headline_text = headline.get_text().lower()
+        
+                if 'dil' in headline_text:
+                    lang_items = boxed_list.find_all('li')
+                    languages = [li.get_text(strip=True) for li in lang_items if li.get_text(strip=True)]
+                    data['languages'] = ' | '.join(languages)
+                    data['languages_structured'] = [
+                        record for record in (parse_language(' '.join(li.stripped_strings)) for li in lang_items) if record
+                    ]
+        
+                elif 'təhsil' in headline_text:
+                    edu_items = boxed_list.find_all('li')
+                    education = [li.get_text(strip=True) for li in edu_items if li.get_text(strip=True)]
+                    data['education'] = ' | '.join(education)
+                    data['education_structured'] = [
+                        record for record in (parse_education(list(li.stripped_strings)) for li in edu_items) if record
+                    ]
+        
+                elif 'tarixçə' in headline_text:
+                    work_items = boxed_list.find_all('li')
+                    work_history = [li.get_text(strip=True) for li in work_items if li.get_text(strip=True)]
+                    data['work_history'] = ' | '.join(work_history)
+                    data['work_history_structured'] = [
+                        record for record in (parse_work_history(list(li.stripped_strings)) for li in work_items) if record
+                    ]
+        
+        # Extract about section
+        about_section = soup.find('div', class_='single-page-section')
+        if about_section:
+            about_p = about_section.find('p')
+            if about_p:
+                data['about'] = about_p.get_text(strip=True)
+        
+        return data
+    
     async def extract_candidate_data(self, session: aiohttp.ClientSession, candidate_url: str) -> Optional[Dict]:
         """Extract all data from a candidate's profile page"""
         
@@ -125,116 +276,40 @@ class BusyAzFullScraper:
                     if response.status != 200:
                         if response.status != 404:  # 404s are expected for some profiles
                             logger.warning(f"Candidate {candidate_url}: HTTP {response.status}")
+                        if self.frontier:
+                            self.frontier.record_fetch(candidate_url, ok=False)
                         return None
                     
                     html = await response.text()
-                    soup = BeautifulSoup(html, 'html.parser')
-                    
-                    data = {
-                        'phone_number': '',
-                        'name': '',
-                        'position': '',
-                        'mobile_phone': '',
-                        'home_phone': '',
-                        'email': '',
-                        'gender': '',
-                        'salary_expectation': '',
-                        'skills': '',
-                        'languages': '',
-                        'education': '',
-                        'work_history': '',
-                        'about': '',
-                        'desired_positions': '',
-                        'url': candidate_url
-                    }
-                    
-                    # Extract name
-                    name_elem = soup.find('h3')
-                    if name_elem:
-                        data['name'] = name_elem.get_text(strip=True)
-                    
-                    # Extract position
-                    position_elem = soup.find('p', class_='header-under-name')
-                    if position_elem:
-                        data['position'] = position_elem.get_text(strip=True)
-                    
-                    # Extract personal information from sidebar tables
-                    tables = soup.find_all('table')
-                    for table in tables:
-                        rows = table.find_all('tr')
-                        for row in rows:
-                            th = row.find('th')
-                            td = row.find('td')
-                            if th and td:
-                                field_name = th.get_text(strip=True).lower()
-                                field_value = td.get_text(strip=True)
-                                
-                                if 'mobil telefon' in field_name:
-                                    data['mobile_phone'] = field_value
-                                    if not data['phone_number']:
-                                        data['phone_number'] = field_value
-                                elif 'ev telefonu' in field_name:
-                                    data['home_phone'] = field_value
-                                    if not data['phone_number']:
-                                        data['phone_number'] = field_value
-                                elif 'e-mail' in field_name:
-                                    data['email'] = field_value
-                                elif 'cins' in field_name:
-                                    data['gender'] = field_value
-                                elif 'maaş' in field_name:
-                                    data['salary_expectation'] = field_value
+                    html_hash = None
+                    if self.tracker:
+                        html_hash = hash_html(html)
+                        cached = self.tracker.get_unchanged(candidate_url, html_hash)
+                        if cached is not None:
+                            if self.frontier:
+                                self.frontier.record_fetch(candidate_url, changed=False)
+                            return cached
                     
-                    # Extract skills and desired positions from sidebar
-                    sidebar_widgets = soup.find_all('div', class_='sidebar-widget')
-                    for widget in sidebar_widgets:
-                        h3 = widget.find('h3')
-                        if h3:
-                            h3_text = h3.get_text().lower()
-                            task_tags = widget.find('div', class_='task-tags')
-                            if task_tags:
-                                if 'bilik' in h3_text or 'bacarıq' in h3_text:
-                                    skills = [span.get_text(strip=True) for span in task_tags.find_all('span')]
-                                    data['skills'] = ', '.join(skills)
-                                elif 'ixtisas' in h3_text and 'istədiyi' in h3_text:
-                                    positions = [span.get_text(strip=True) for span in task_tags.find_all('span')]
-                                    data['desired_positions'] = ', '.join(positions)
+                    data = self.parse_candidate_html(html, candidate_url)
                     
-                    # Extract languages, education, work history from boxed lists
-                    boxed_lists = soup.find_all('div', class_='boxed-list')
-                    for boxed_list in boxed_lists:
-                        headline = boxed_list.find('h3')
-                        if headline:
-                            headline_text = headline.get_text().lower()
-                            
-                            if 'dil' in headline_text:
-                                lang_items = boxed_list.find_all('li')
-                                languages = [li.get_text(strip=True) for li in lang_items if li.get_text(strip=True)]
-                                data['languages'] = ' | '.join(languages)
-                            
-                            elif 'təhsil' in headline_text:
-                                edu_items = boxed_list.find_all('li')
-                                education = [li.get_text(strip=True) for li in edu_items if li.get_text(strip=True)]
-                                data['education'] = ' | '.join(education)
-                            
-                            elif 'tarixçə' in headline_text:
-                                work_items = boxed_list.find_all('li')
-                                work_history = [li.get_text(strip=True) for li in work_items if li.get_text(strip=True)]
-                                data['work_history'] = ' | '.join(work_history)
-                    
-                    # Extract about section
-                    about_section = soup.find('div', class_='single-page-section')
-                    if about_section:
-                        about_p = about_section.find('p')
-                        if about_p:
-                            data['about'] = about_p.get_text(strip=True)
+                    event = None
+                    if self.tracker:
+                        event = self.tracker.update(candidate_url, html_hash, data)
+                    if self.frontier:
+                        changed = bool(event and event['event'] == 'updated')
+                        self.frontier.record_fetch(candidate_url, changed=changed)
                     
                     return data
                     
             except asyncio.TimeoutError:
                 logger.warning(f"Timeout scraping {candidate_url}")
+                if self.frontier:
+                    self.frontier.record_fetch(candidate_url, ok=False)
                 return None
             except Exception as e:
                 logger.error(f"Error scraping {candidate_url}: {e}")
+                if self.frontier:
+                    self.frontier.record_fetch(candidate_url, ok=False)
                 return None
     
     async def scrape_candidates_batch(self, session: aiohttp.ClientSession, urls: List[str]) -> List[Dict]:
@@ -249,42 +324,39 @@ class BusyAzFullScraper:
             elif isinstance(result, Exception):
                 logger.error(f"Candidate batch error: {result}")
         
+        # Stream the batch to the export sinks once all of its fetches have completed
+        if self.pipeline:
+            for candidate in candidates:
+                await self.pipeline.push(candidate)
+        
         return candidates
     
-    def save_progress(self, filename: str = 'busy_az_candidates.csv'):
+    def save_progress(self, filename: Optional[str] = None):
         """Save current progress to CSV"""
         if not self.scraped_candidates:
             return
-            
-        fieldnames = [
-            'phone_number',
-            'name',
-            'position',
-            'mobile_phone',
-            'home_phone',
-            'email',
-            'gender',
-            'salary_expectation',
-            'skills',
-            'languages',
-            'education',
-            'work_history',
-            'about',
-            'desired_positions',
-            'url'
-        ]
+        filename = filename or self.output_file
         
         with open(filename, 'w', newline='', encoding='utf-8') as csvfile:
-            writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
+            writer = csv.DictWriter(csvfile, fieldnames=CANDIDATE_FIELDS)
             writer.writeheader()
             
             for candidate in self.scraped_candidates:
-                row = {}
-                for field in fieldnames:
-                    row[field] = candidate.get(field, '')
-                writer.writerow(row)
+                writer.writerow(flatten_record(candidate))
         
         logger.info(f"💾 Progress saved: {len(self.scraped_candidates)} candidates to {filename}")
+        
+        if self.tracker:
+            self.tracker.save()
+        if self.frontier:
+            self.frontier.save()
+    
+    def load_output(self) -> List[Dict]:
+        """Candidates already in the output CSV, if it exists"""
+        if not os.path.exists(self.output_file):
+            return []
+        with open(self.output_file, 'r', newline='', encoding='utf-8') as csvfile:
+            return [unflatten_record(row) for row in csv.DictReader(csvfile)]
     
     async def scrape_all_pages(self) -> List[Dict]:
         """Scrape ALL pages from busy.az"""
@@ -304,6 +376,9 @@ class BusyAzFullScraper:
                 try:
                     # Get candidate URLs from current page
                     candidate_urls = await self.get_candidate_urls_from_page(session, page)
+                    if self.frontier:
+                        for url in candidate_urls:
+                            self.frontier.discover(url)
                     
                     if not candidate_urls:
                         consecutive_empty_pages += 1
@@ -318,12 +393,16 @@ class BusyAzFullScraper:
                     page_candidates = []
                     
                     for i in range(0, len(candidate_urls), batch_size):
+                        # Backpressure: don't fetch more than the slowest sink can absorb
+                        if self.pipeline:
+                            await self.pipeline.wait_for_capacity()
+                        
                         batch_urls = candidate_urls[i:i + batch_size]
                         batch_candidates = await self.scrape_candidates_batch(session, batch_urls)
                         page_candidates.extend(batch_candidates)
                         
                         # Short delay between batches
-                        await asyncio.sleep(0.8)
+                        await asyncio.sleep(self.batch_delay)
                     
                     self.scraped_candidates.extend(page_candidates)
                     
@@ -336,7 +415,7 @@ class BusyAzFullScraper:
                     page += 1
                     
                     # Longer delay between pages
-                    await asyncio.sleep(1.5)
+                    await asyncio.sleep(self.page_delay)
                     
                 except KeyboardInterrupt:
                     logger.info("🛑 Interrupted by user, saving progress...")
@@ -353,34 +432,127 @@ class BusyAzFullScraper:
         elapsed = time.time() - start_time
         logger.info(f"🎉 Full scraping completed in {elapsed:.2f} seconds")
         logger.info(f"📊 Total candidates scraped: {len(self.scraped_candidates)}")
+        if self.tracker:
+            stats = self.tracker.stats
+            logger.info(f"🔁 Unchanged: {stats['unchanged']}, added: {stats['added']}, "
+                        f"updated: {stats['updated']}, markup-only changes: {stats['rehashed']}")
         
         return self.scraped_candidates
 
+    async def refresh_from_frontier(self, request_budget: int, discovery_pages: int = 3) -> List[Dict]:
+        """Spend a fixed request budget on new and most-likely-stale profiles"""
+        if not (self.frontier and self.tracker):
+            raise ValueError("Refreshing from the frontier requires both a CrawlFrontier and a ChangeTracker")
+        
+        start_time = time.time()
+        
+        async with await self.create_session() as session:
+            # Newest jobseekers are listed first, so a few listing pages find new ids
+            discovery_pages = min(discovery_pages, request_budget)
+            for page in range(1, discovery_pages + 1):
+                for url in await self.get_candidate_urls_from_page(session, page):
+                    self.frontier.discover(url)
+            
+            urls = self.frontier.select(request_budget - discovery_pages)
+            logger.info(f"🧭 Refreshing {len(urls)} profiles (budget {request_budget}, "
+                        f"{discovery_pages} listing pages, frontier size {len(self.frontier.entries)})")
+            
+            batch_size = 15
+            refreshed = []
+            for i in range(0, len(urls), batch_size):
+                if self.pipeline:
+                    await self.pipeline.wait_for_capacity()
+                refreshed.extend(await self.scrape_candidates_batch(session, urls[i:i + batch_size]))
+                await asyncio.sleep(self.batch_delay)
+        
+        # The change index may know fewer profiles than the output CSV (e.g. rows scraped
+        # before change tracking existed), so merge by URL rather than rewrite from the index
+        merged = {candidate['url']: candidate for candidate in self.load_output()}
+        for record in self.tracker.records():
+            merged[record['url']] = record
+        self.scraped_candidates = sorted(
+            merged.values(),
+            key=lambda candidate: int(jobseeker_id(candidate['url'])) if jobseeker_id(candidate['url']).isdigit() else 0,
+            reverse=True
+        )
+        self.save_progress()
+        
+        elapsed = time.time() - start_time
+        logger.info(f"🎉 Refresh completed in {elapsed:.2f} seconds: {len(refreshed)} profiles fetched")
+        stats = self.tracker.stats
+        logger.info(f"🔁 Unchanged: {stats['unchanged']}, added: {stats['added']}, updated: {stats['updated']}")
+        
+        return refreshed
+
 def signal_handler(signum, frame):
     """Handle Ctrl+C gracefully"""
     print("\n🛑 Received interrupt signal. Saving progress and exiting...")
     sys.exit(0)
 
+def parse_args():
+    parser = argparse.ArgumentParser(description='Scrape candidate profiles from busy.az')
+    parser.add_argument('--base-url', default=DEFAULT_BASE_URL, help='Site to crawl, e.g. a local mock server')
+    parser.add_argument('--state-dir',
+                        help='Directory for the output CSV, change index and frontier '
+                             '(default: current directory for busy.az, runs/<host> otherwise)')
+    parser.add_argument('--concurrency', type=int, default=8)
+    parser.add_argument('--output', help='Output CSV (default: busy_az_candidates.csv in the state directory)')
+    parser.add_argument('--refresh-budget', type=int,
+                        help='Instead of a full sweep, refresh the highest-priority profiles using at most this many requests')
+    parser.add_argument('--discovery-pages', type=int, default=3,
+                        help='Listing pages to check for new candidates in refresh mode')
+    parser.add_argument('--sink', action='append', default=[], metavar='KIND[:PATH]',
+                        help=f"Stream candidates to a sink as they are parsed; repeatable. Relative paths "
+                             f"are resolved against the state directory. Kinds: {', '.join(SINK_TYPES)}")
+    parser.add_argument('--sink-buffer', type=int, default=1000, help='Per-sink buffer size (records)')
+    return parser.parse_args()
+
 async def main():
+    args = parse_args()
+    
     # Set up signal handler for graceful shutdown
     signal.signal(signal.SIGINT, signal_handler)
     
-    scraper = BusyAzFullScraper(max_concurrent=8)
+    state_dir = args.state_dir or default_state_dir(args.base_url)
+    os.makedirs(state_dir, exist_ok=True)
+    if state_dir != '.':
+        logger.info(f"📂 Writing output and crawl state to {state_dir}")
+    
+    scraper = BusyAzFullScraper(
+        max_concurrent=args.concurrency,
+        tracker=ChangeTracker(
+            index_path=os.path.join(state_dir, 'busy_az_index.json'),
+            changes_path=os.path.join(state_dir, 'busy_az_changes.jsonl'),
+            parser_version=PARSER_VERSION
+        ),
+        base_url=args.base_url,
+        output_file=args.output or os.path.join(state_dir, 'busy_az_candidates.csv'),
+        frontier=CrawlFrontier(os.path.join(state_dir, 'busy_az_frontier.json'))
+    )
     
     try:
-        candidates = await scraper.scrape_all_pages()
+        sinks = [create_sink(spec, directory=state_dir, buffer_size=args.sink_buffer) for spec in args.sink]
+        async with ExportPipeline(sinks) as pipeline:
+            scraper.pipeline = pipeline if sinks else None
+            if args.refresh_budget is not None:
+                candidates = await scraper.refresh_from_frontier(args.refresh_budget, args.discovery_pages)
+            else:
+                candidates = await scraper.scrape_all_pages()
+        
+        # Keep stdout clean for the stdout sink
+        summary = sys.stderr if any(sink.name == 'stdout' for sink in sinks) else sys.stdout
         
-        print(f"\n🎉 Scraping completed successfully!")
-        print(f"📊 Total candidates found: {len(candidates)}")
-        print(f"📁 Data saved to: busy_az_candidates.csv")
+        print(f"\n🎉 Scraping completed successfully!", file=summary)
+        print(f"📊 Total candidates found: {len(candidates)}", file=summary)
+        print(f"📁 Data saved to: {scraper.output_file}", file=summary)
         
         # Show sample of data
         if candidates:
-            print(f"\n📋 Sample candidate:")
+            print(f"\n📋 Sample candidate:", file=summary)
             sample = candidates[0]
-            print(f"   Name: {sample.get('name', 'N/A')}")
-            print(f"   Phone: {sample.get('phone_number', 'N/A')}")
-            print(f"   Position: {sample.get('position', 'N/A')}")
+            print(f"   Name: {sample.get('name', 'N/A')}", file=summary)
+            print(f"   Phone: {sample.get('phone_number', 'N/A')}", file=summary)
+            print(f"   Position: {sample.get('position', 'N/A')}", file=summary)
         
     except KeyboardInterrupt:
         print("\n🛑 Scraping interrupted by user")
@@ -0,0 +1,325 @@
+"""
+Full-text and faceted search over scraped busy.az candidates
+Builds an on-disk inverted index with Azerbaijani-aware case folding and
+facet bitmaps for gender, salary band and language
+"""
+
+import argparse
+import bisect
+import csv
+import heapq
+import json
+import logging
+import math
+import os
+import re
+import time
+import unicodedata
+from collections import Counter, defaultdict
+from typing import Dict, Iterable, List, Optional
+
+from dedupe import choose_input_file
+from parsers import parse_language, parse_salary
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+INDEX_FILE = 'busy_az_search_index.json'
+
+# Field boosts applied to term frequencies
+SEARCH_FIELDS = {
+    'name': 3.0,
+    'position': 2.5,
+    'desired_positions': 2.0,
+    'skills': 1.5,
+    'about': 1.0
+}
+RESULT_FIELDS = ['name', 'position', 'gender', 'salary_expectation', 'phone_number', 'url']
+
+SALARY_BANDS = [
+    (500, '0-500'),
+    (1000, '500-1000'),
+    (1500, '1000-1500'),
+    (2000, '1500-2000'),
+    (float('inf'), '2000+')
+]
+NEGOTIABLE_BAND = 'razılaşma'
+
+# BM25 parameters
+K1 = 1.2
+B = 0.75
+MAX_PREFIX_EXPANSIONS = 50
+PREFIX_MATCH_WEIGHT = 0.7
+
+# Dotted/dotless I must be mapped before lower(), which would otherwise give 'i̇' and 'i'
+_AZ_CASE_MAP = str.maketrans({'I': 'ı', 'İ': 'i'})
+_AZ_DIACRITICS_MAP = str.maketrans({
+    'ə': 'e', 'ı': 'i', 'ş': 's', 'ç': 'c', 'ğ': 'g', 'ö': 'o', 'ü': 'u'
+})
+_TOKEN_PATTERN = re.compile(r'\w+')
+
+
+def fold_text(text: str) -> str:
+    """Azerbaijani-aware case folding with diacritics removed"""
+    text = (text or '').translate(_AZ_CASE_MAP).lower().translate(_AZ_DIACRITICS_MAP)
+    if text.isascii():
+        return text
+    decomposed = unicodedata.normalize('NFKD', text)
+    return ''.join(ch for ch in decomposed if not unicodedata.combining(ch))
+
+
+def tokenize(text: str) -> List[str]:
+    return _TOKEN_PATTERN.findall(fold_text(text))
+
+
+def salary_band(record: Dict) -> str:
+    """Salary band label for a record, using the typed salary columns if present"""
+    if 'salary_min' in record:
+        amounts = [float(record[f]) for f in ('salary_min', 'salary_max') if record.get(f) not in (None, '')]
+    else:
+        salary = parse_salary(record.get('salary_expectation', ''))
+        amounts = [a for a in (salary['salary_min'], salary['salary_max']) if a is not None]
+    if not amounts:
+        return NEGOTIABLE_BAND
+
+    amount = sum(amounts) / len(amounts)
+    for upper, label in SALARY_BANDS:
+        if amount <= upper:
+            return label
+    return SALARY_BANDS[-1][1]
+
+
+def record_languages(record: Dict) -> List[str]:
+    """Language names for a record, using the structured column if present"""
+    if record.get('languages_structured'):
+        entries = json.loads(record['languages_structured'])
+    else:
+        entries = [parse_language(text) for text in (record.get('languages') or '').split(' | ')]
+    return [entry['language'] for entry in entries if entry and entry.get('language')]
+
+
+def _popcount(bitmap: int) -> int:
+    return bin(bitmap).count('1')
+
+
+# Shifting a bitmap of N docs costs O(N), so per-document work goes through bytes
+
+def _bitmap(doc_ids: Iterable[int], size: int) -> int:
+    """Bitmap with the given doc ids set"""
+    bits = bytearray((size + 7) // 8)
+    for doc_id in doc_ids:
+        bits[doc_id >> 3] |= 1 << (doc_id & 7)
+    return int.from_bytes(bits, 'little')
+
+
+def _bitmap_bytes(bitmap: int, size: int) -> bytes:
+    """Bitmap as little-endian bytes, for O(1) membership tests"""
+    return bitmap.to_bytes((size + 7) // 8, 'little')
+
+
+def _bits(bitmap: int) -> Iterable[int]:
+    for byte_index, byte in enumerate(_bitmap_bytes(bitmap, bitmap.bit_length())):
+        while byte:
+            lowest = byte & -byte
+            yield byte_index * 8 + lowest.bit_length() - 1
+            byte ^= lowest
+
+
+class SearchIndex:
+    def __init__(self, docs: List[Dict], postings: Dict[str, List[List[float]]],
+                 doc_lengths: List[float], facets: Dict[str, Dict[str, Dict]]):
+        self.docs = docs
+        self.postings = postings
+        self.doc_lengths = doc_lengths
+        self.facets = facets
+        self.vocabulary = sorted(postings)
+        self.avg_doc_length = (sum(doc_lengths) / len(doc_lengths)) if doc_lengths else 0.0
+        self.all_docs = (1 << len(docs)) - 1
+
+    @classmethod
+    def build(cls, records: List[Dict]) -> 'SearchIndex':
+        """Build the index from candidate records"""
+        docs = []
+        postings = defaultdict(list)
+        doc_lengths = []
+        facet_members = defaultdict(lambda: defaultdict(list))
+        facet_labels = defaultdict(dict)
+
+        for doc_id, record in enumerate(records):
+            docs.append({field: record.get(field, '') or '' for field in RESULT_FIELDS})
+
+            weighted_tf = Counter()
+            for field, boost in SEARCH_FIELDS.items():
+                for token in tokenize(record.get(field, '')):
+                    weighted_tf[token] += boost
+            for token, tf in weighted_tf.items():
+                postings[token].append([doc_id, tf])
+            doc_lengths.append(sum(weighted_tf.values()))
+
+            facet_values = {
+                'gender': [record.get('gender') or 'Məlum deyil'],
+                'salary_band': [salary_band(record)],
+                'language': record_languages(record)
+            }
+            for facet, values in facet_values.items():
+                for value in values:
+                    key = fold_text(value)
+                    facet_members[facet][key].append(doc_id)
+                    facet_labels[facet].setdefault(key, value)
+
+        facets = {
+            facet: {key: {'label': facet_labels[facet][key], 'bitmap': _bitmap(members, len(docs))}
+                    for key, members in values.items()}
+            for facet, values in facet_members.items()
+        }
+        return cls(docs, dict(postings), doc_lengths, facets)
+
+    def save(self, path: str = INDEX_FILE):
+        payload = {
+            'docs': self.docs,
+            'postings': self.postings,
+            'doc_lengths': self.doc_lengths,
+            'facets': {
+                facet: {key: {'label': entry['label'], 'bitmap': format(entry['bitmap'], 'x')}
+                        for key, entry in values.items()}
+                for facet, values in self.facets.items()
+            }
+        }
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(payload, f, ensure_ascii=False, separators=(',', ':'))
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: str = INDEX_FILE) -> 'SearchIndex':
+        with open(path, 'r', encoding='utf-8') as f:
+            payload = json.load(f)
+        facets = {
+            facet: {key: {'label': entry['label'], 'bitmap': int(entry['bitmap'], 16)}
+                    for key, entry in values.items()}
+            for facet, values in payload['facets'].items()
+        }
+        return cls(payload['docs'], payload['postings'], payload['doc_lengths'], facets)
+
+    def _expand(self, token: str) -> List[tuple]:
+        """Exact term plus vocabulary terms it prefixes (suffixed word forms)"""
+        expansions = [(token, 1.0)] if token in self.postings else []
+        start = bisect.bisect_right(self.vocabulary, token)
+        for term in self.vocabulary[start:start + MAX_PREFIX_EXPANSIONS]:
+            if not term.startswith(token):
+                break
+            expansions.append((term, PREFIX_MATCH_WEIGHT))
+        return expansions
+
+    def facet_mask(self, filters: Dict[str, Iterable[str]]) -> int:
+        """AND across facets, OR across values within a facet"""
+        mask = self.all_docs
+        for facet, values in filters.items():
+            if isinstance(values, str):
+                values = [values]
+            values = list(values or [])
+            if not values:
+                continue
+            facet_mask = 0
+            for value in values:
+                entry = self.facets.get(facet, {}).get(fold_text(value))
+                if entry:
+                    facet_mask |= entry['bitmap']
+            mask &= facet_mask
+        return mask
+
+    def facet_counts(self, mask: int) -> Dict[str, Dict[str, int]]:
+        counts = {}
+        for facet, values in self.facets.items():
+            facet_counts = {entry['label']: _popcount(entry['bitmap'] & mask) for entry in values.values()}
+            counts[facet] = {label: n for label, n in
+                             sorted(facet_counts.items(), key=lambda item: -item[1]) if n}
+        return counts
+
+    def search(self, query: str = '', k: int = 10, **filters) -> Dict:
+        """Return the top-k matches for a query, optionally restricted by facets"""
+        start_time = time.perf_counter()
+        mask = self.facet_mask(filters)
+        tokens = tokenize(query)
+
+        filtered = mask != self.all_docs
+        allowed = _bitmap_bytes(mask, len(self.docs))
+        scores = defaultdict(float)
+        for token in tokens:
+            for term, weight in self._expand(token):
+                postings = self.postings[term]
+                idf = math.log(1 + (len(self.docs) - len(postings) + 0.5) / (len(postings) + 0.5))
+                for doc_id, tf in postings:
+                    doc_id = int(doc_id)
+                    if filtered and not (allowed[doc_id >> 3] >> (doc_id & 7)) & 1:
+                        continue
+                    norm = K1 * (1 - B + B * self.doc_lengths[doc_id] / self.avg_doc_length)
+                    scores[doc_id] += weight * idf * tf * (K1 + 1) / (tf + norm)
+
+        if tokens:
+            matched = _bitmap(scores, len(self.docs))
+            top = heapq.nlargest(k, scores.items(), key=lambda item: item[1])
+        else:
+            matched = mask
+            top = [(doc_id, 0.0) for doc_id, _ in zip(_bits(mask), range(k))]
+
+        return {
+            'total': _popcount(matched),
+            'results': [dict(self.docs[doc_id], score=round(score, 4)) for doc_id, score in top],
+            'facets': self.facet_counts(matched),
+            'took_ms': round((time.perf_counter() - start_time) * 1000, 3)
+        }
+
+
+def build_index(input_file: Optional[str] = None, output_file: str = INDEX_FILE) -> SearchIndex:
+    """Build and save the index from the (canonical, if up to date) candidate CSV"""
+    if input_file is None:
+        input_file = choose_input_file()
+
+    with open(input_file, 'r', newline='', encoding='utf-8') as csvfile:
+        records = list(csv.DictReader(csvfile))
+
+    index = SearchIndex.build(records)
+    index.save(output_file)
+    logger.info(f"🔎 Indexed {len(records)} candidates ({len(index.postings)} terms) to {output_file}")
+    return index
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Search busy.az candidates')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    build_parser = subparsers.add_parser('build', help='Build the search index from the candidate CSV')
+    build_parser.add_argument('input', nargs='?', help='Candidate CSV (defaults to the canonical CSV unless it predates the scrape)')
+    build_parser.add_argument('--index', default=INDEX_FILE)
+
+    search_parser = subparsers.add_parser('search', help='Query the search index')
+    search_parser.add_argument('query', nargs='?', default='')
+    search_parser.add_argument('-k', type=int, default=10)
+    search_parser.add_argument('--gender', action='append')
+    search_parser.add_argument('--salary-band', action='append',
+                               help=f"One of: {', '.join(label for _, label in SALARY_BANDS)}, {NEGOTIABLE_BAND}")
+    search_parser.add_argument('--language', action='append')
+    search_parser.add_argument('--index', default=INDEX_FILE)
+
+    args = parser.parse_args()
+
+    if args.command == 'build':
+        build_index(args.input, args.index)
+        return
+
+    index = SearchIndex.load(args.index)
+    response = index.search(args.query, k=args.k, gender=args.gender,
+                            salary_band=args.salary_band, language=args.language)
+
+    print(f"\n🔎 {response['total']} matches in {response['took_ms']} ms\n")
+    for rank, result in enumerate(response['results'], 1):
+        print(f"{rank:>3}. {result['name']} — {result['position']} "
+              f"[{result['salary_expectation']}] {result['url']} (score {result['score']})")
+    for facet, counts in response['facets'].items():
+        summary = ', '.join(f"{label}: {n}" for label, n in list(counts.items())[:8])
+        print(f"\n   {facet}: {summary}")
+
+
+if __name__ == "__main__":
+    main()
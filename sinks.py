@@ -0,0 +1,387 @@
+"""
+Streaming export sinks for scraped candidates
+Each parsed candidate is pushed once through an async pipeline that fans out
+to any combination of CSV, JSON Lines, SQLite, Parquet and stdout sinks.
+Every sink has its own bounded buffer; a full buffer makes push() wait,
+which slows the crawler down to the pace of the slowest sink.
+"""
+
+import asyncio
+import csv
+import json
+import logging
+import os
+import sqlite3
+import sys
+from abc import ABC, abstractmethod
+from typing import Dict, List, Optional
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # Parquet output is optional
+    pa = None
+    pq = None
+
+logger = logging.getLogger(__name__)
+
+CANDIDATE_FIELDS = [
+    'phone_number',
+    'name',
+    'position',
+    'mobile_phone',
+    'home_phone',
+    'email',
+    'gender',
+    'salary_expectation',
+    'skills',
+    'languages',
+    'education',
+    'work_history',
+    'about',
+    'desired_positions',
+    'url',
+    'salary_min',
+    'salary_max',
+    'salary_currency',
+    'salary_negotiable',
+    'languages_structured',
+    'education_structured',
+    'work_history_structured'
+]
+# List-valued columns, stored as JSON in flat formats
+STRUCTURED_FIELDS = ['languages_structured', 'education_structured', 'work_history_structured']
+# Keys of the entries in each list column (see parsers.py); 'current' is boolean, the rest strings
+STRUCTURED_KEYS = {
+    'languages_structured': ['language', 'level', 'level_label'],
+    'education_structured': ['institution', 'start', 'end', 'current', 'country', 'city', 'details'],
+    'work_history_structured': ['title', 'employer', 'start', 'end', 'current', 'country', 'city', 'description']
+}
+NUMERIC_FIELDS = ['salary_min', 'salary_max']
+BOOLEAN_FIELDS = ['salary_negotiable']
+
+DEFAULT_PATHS = {
+    'csv': 'busy_az_stream.csv',
+    'jsonl': 'busy_az_candidates.jsonl',
+    'sqlite': 'busy_az_candidates.db',
+    'parquet': 'busy_az_candidates.parquet'
+}
+
+
+def flatten_record(record: Dict, fieldnames: List[str] = CANDIDATE_FIELDS) -> Dict:
+    """Row for flat formats: list columns as JSON, missing values as ''"""
+    row = {}
+    for field in fieldnames:
+        value = record.get(field, '')
+        if field in STRUCTURED_FIELDS:
+            value = json.dumps(value or [], ensure_ascii=False)
+        row[field] = '' if value is None else value
+    return row
+
+
+def unflatten_record(row: Dict) -> Dict:
+    """Record from a flat CSV row, the inverse of flatten_record"""
+    record = dict(row)
+    for field in STRUCTURED_FIELDS:
+        if field in record:
+            record[field] = json.loads(record[field]) if record[field] else []
+    for field in NUMERIC_FIELDS:
+        if field in record:
+            record[field] = float(record[field]) if record[field] else None
+    if record.get('salary_negotiable') in ('True', 'False'):
+        record['salary_negotiable'] = record['salary_negotiable'] == 'True'
+    return record
+
+
+class Sink(ABC):
+    """Base sink: a bounded buffer drained in batches by a worker task"""
+    name = 'sink'
+
+    def __init__(self, buffer_size: int = 1000, batch_size: int = 100):
+        self.buffer_size = buffer_size
+        self.batch_size = batch_size
+        self.low_watermark = buffer_size // 2
+        self.queue: Optional[asyncio.Queue] = None
+        self.drained: Optional[asyncio.Event] = None
+        self.written = 0
+
+    # Blocking I/O, run in a worker thread so the crawler's event loop stays free
+    def open(self):
+        pass
+
+    @abstractmethod
+    def write_batch(self, records: List[Dict]):
+        ...
+
+    def close(self):
+        pass
+
+    async def run(self):
+        """Drain the buffer until the end-of-stream sentinel arrives"""
+        loop = asyncio.get_running_loop()
+        finished = False
+        while not finished:
+            batch = [await self.queue.get()]
+            while len(batch) < self.batch_size and not self.queue.empty():
+                batch.append(self.queue.get_nowait())
+            if batch[-1] is None:
+                batch.pop()
+                finished = True
+
+            if batch:
+                try:
+                    await loop.run_in_executor(None, self.write_batch, batch)
+                    self.written += len(batch)
+                except Exception as e:
+                    logger.error(f"Sink {self.name}: failed to write {len(batch)} records: {e}")
+
+            if self.queue.qsize() <= self.low_watermark:
+                self.drained.set()
+
+    @property
+    def pressure(self) -> float:
+        """Buffer fill ratio, 0.0 (empty) to 1.0 (full)"""
+        return self.queue.qsize() / self.buffer_size if self.queue else 0.0
+
+
+class CsvSink(Sink):
+    name = 'csv'
+
+    def __init__(self, path: str = DEFAULT_PATHS['csv'], fieldnames: List[str] = CANDIDATE_FIELDS, **kwargs):
+        super().__init__(**kwargs)
+        self.path = path
+        self.fieldnames = fieldnames
+        self.file = None
+        self.writer = None
+
+    def open(self):
+        self.file = open(self.path, 'w', newline='', encoding='utf-8')
+        self.writer = csv.DictWriter(self.file, fieldnames=self.fieldnames)
+        self.writer.writeheader()
+
+    def write_batch(self, records: List[Dict]):
+        self.writer.writerows(flatten_record(record, self.fieldnames) for record in records)
+        self.file.flush()
+
+    def close(self):
+        if self.file:
+            self.file.close()
+
+
+class JsonLinesSink(Sink):
+    name = 'jsonl'
+
+    def __init__(self, path: str = DEFAULT_PATHS['jsonl'], **kwargs):
+        super().__init__(**kwargs)
+        self.path = path
+        self.file = None
+
+    def open(self):
+        self.file = open(self.path, 'w', encoding='utf-8')
+
+    def write_batch(self, records: List[Dict]):
+        self.file.writelines(json.dumps(record, ensure_ascii=False) + '\n' for record in records)
+        self.file.flush()
+
+    def close(self):
+        if self.file:
+            self.file.close()
+
+
+class StdoutSink(Sink):
+    name = 'stdout'
+
+    def write_batch(self, records: List[Dict]):
+        sys.stdout.writelines(json.dumps(record, ensure_ascii=False) + '\n' for record in records)
+        sys.stdout.flush()
+
+
+class SqliteSink(Sink):
+    """Upserts candidates keyed by profile URL"""
+    name = 'sqlite'
+
+    def __init__(self, path: str = DEFAULT_PATHS['sqlite'], table: str = 'candidates',
+                 fieldnames: List[str] = CANDIDATE_FIELDS, **kwargs):
+        super().__init__(**kwargs)
+        self.path = path
+        self.table = table
+        self.fieldnames = fieldnames
+        self.connection = None
+
+    def open(self):
+        # The connection is used from executor threads, one batch at a time
+        self.connection = sqlite3.connect(self.path, check_same_thread=False)
+        columns = ', '.join(f'"{field}" {self.column_type(field)}' for field in self.fieldnames)
+        self.connection.execute(f'CREATE TABLE IF NOT EXISTS "{self.table}" ({columns})')
+        self.connection.commit()
+
+    @staticmethod
+    def column_type(field: str) -> str:
+        if field == 'url':
+            return 'TEXT PRIMARY KEY'
+        if field in NUMERIC_FIELDS:
+            return 'REAL'
+        if field in BOOLEAN_FIELDS:
+            return 'INTEGER'
+        return 'TEXT'
+
+    @staticmethod
+    def column_value(field: str, record: Dict, row: Dict):
+        if field in NUMERIC_FIELDS:
+            return record.get(field)
+        if field in BOOLEAN_FIELDS:
+            value = record.get(field)
+            # SQLite has no boolean type: store 0/1
+            return int(value) if isinstance(value, bool) else None
+        return row[field]
+
+    def write_batch(self, records: List[Dict]):
+        columns = ', '.join(f'"{field}"' for field in self.fieldnames)
+        placeholders = ', '.join('?' for _ in self.fieldnames)
+        rows = []
+        for record in records:
+            row = flatten_record(record, self.fieldnames)
+            rows.append([self.column_value(field, record, row) for field in self.fieldnames])
+        self.connection.executemany(
+            f'INSERT OR REPLACE INTO "{self.table}" ({columns}) VALUES ({placeholders})', rows
+        )
+        self.connection.commit()
+
+    def close(self):
+        if self.connection:
+            self.connection.close()
+
+
+class ParquetSink(Sink):
+    """Writes each batch as a row group of a single Parquet file (requires pyarrow)"""
+    name = 'parquet'
+
+    def __init__(self, path: str = DEFAULT_PATHS['parquet'], fieldnames: List[str] = CANDIDATE_FIELDS,
+                 batch_size: int = 500, **kwargs):
+        super().__init__(batch_size=batch_size, **kwargs)
+        self.path = path
+        self.fieldnames = fieldnames
+        self.writer = None
+
+    def open(self):
+        if pq is None:
+            raise RuntimeError("Parquet output requires pyarrow: pip install pyarrow")
+        self.schema = pa.schema([(field, self.column_type(field)) for field in self.fieldnames])
+        self.writer = pq.ParquetWriter(self.path, self.schema)
+
+    @staticmethod
+    def column_type(field: str) -> 'pa.DataType':
+        if field in NUMERIC_FIELDS:
+            return pa.float64()
+        if field in BOOLEAN_FIELDS:
+            return pa.bool_()
+        if field in STRUCTURED_FIELDS:
+            return pa.list_(pa.struct([
+                (key, pa.bool_() if key == 'current' else pa.string()) for key in STRUCTURED_KEYS[field]
+            ]))
+        return pa.string()
+
+    def write_batch(self, records: List[Dict]):
+        columns = {field: [] for field in self.fieldnames}
+        for record in records:
+            row = flatten_record(record, self.fieldnames)
+            for field in self.fieldnames:
+                if field in NUMERIC_FIELDS or field in BOOLEAN_FIELDS:
+                    columns[field].append(record.get(field))
+                elif field in STRUCTURED_FIELDS:
+                    columns[field].append(record.get(field) or [])
+                else:
+                    columns[field].append(str(row[field]))
+        self.writer.write_table(pa.Table.from_pydict(columns, schema=self.schema))
+
+    def close(self):
+        if self.writer:
+            self.writer.close()
+
+
+SINK_TYPES = {
+    'csv': CsvSink,
+    'jsonl': JsonLinesSink,
+    'sqlite': SqliteSink,
+    'parquet': ParquetSink,
+    'stdout': StdoutSink
+}
+
+
+def create_sink(spec: str, directory: str = '.', **kwargs) -> Sink:
+    """Build a sink from a 'kind[:path]' spec, e.g. 'jsonl' or 'sqlite:out.db'
+
+    Default and relative paths are resolved against directory.
+    """
+    kind, _, path = spec.partition(':')
+    if kind not in SINK_TYPES:
+        raise ValueError(f"Unknown sink '{kind}', expected one of: {', '.join(SINK_TYPES)}")
+    path = path or DEFAULT_PATHS.get(kind)
+    if path:
+        kwargs['path'] = os.path.join(directory, path)
+    return SINK_TYPES[kind](**kwargs)
+
+
+class ExportPipeline:
+    """Fans each pushed candidate out to every sink's buffer"""
+
+    def __init__(self, sinks: List[Sink]):
+        self.sinks = sinks
+        self.workers: List[asyncio.Task] = []
+
+    async def start(self):
+        loop = asyncio.get_running_loop()
+        # Open every sink before starting any worker, so a failure leaves nothing running
+        opened = []
+        try:
+            for sink in self.sinks:
+                await loop.run_in_executor(None, sink.open)
+                opened.append(sink)
+        except Exception:
+            for sink in opened:
+                await loop.run_in_executor(None, sink.close)
+            raise
+
+        for sink in self.sinks:
+            sink.queue = asyncio.Queue(maxsize=sink.buffer_size)
+            sink.drained = asyncio.Event()
+            sink.drained.set()
+            self.workers.append(asyncio.create_task(sink.run()))
+        logger.info(f"🚰 Export pipeline started: {', '.join(sink.name for sink in self.sinks)}")
+
+    async def push(self, record: Dict):
+        """Enqueue a record for every sink; waits while any sink's buffer is full"""
+        for sink in self.sinks:
+            await sink.queue.put(record)
+            if sink.queue.qsize() > sink.low_watermark:
+                sink.drained.clear()
+
+    @property
+    def pressure(self) -> float:
+        """Fill ratio of the fullest sink buffer"""
+        return max((sink.pressure for sink in self.sinks), default=0.0)
+
+    async def wait_for_capacity(self):
+        """Backpressure signal for the crawler: wait until every buffer is below its low watermark"""
+        for sink in self.sinks:
+            while sink.queue.qsize() > sink.low_watermark:
+                # The worker sets the event once a batch leaves the buffer at or below the watermark
+                sink.drained.clear()
+                await sink.drained.wait()
+
+    async def close(self):
+        for sink in self.sinks:
+            await sink.queue.put(None)
+        await asyncio.gather(*self.workers)
+        loop = asyncio.get_running_loop()
+        for sink in self.sinks:
+            await loop.run_in_executor(None, sink.close)
+            logger.info(f"🚰 Sink {sink.name}: {sink.written} records written")
+        self.workers = []
+
+    async def __aenter__(self) -> 'ExportPipeline':
+        await self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()